@@ -8,12 +8,19 @@ Ein einfaches Grid-basiertes Wachstumssimulationssystem mit:
 - 3 Stopper (Wachstumsbegrenzer)
 - Interaktive Auswahl
 - Rhino 3D Visualisierung
+
+Benötigt NumPy (Rhino 8 / CPython).
 """
 
 import rhinoscriptsyntax as rs
+import Rhino
 import Rhino.Geometry as rg
+import scriptcontext as sc
+import System
+import System.Drawing
 import random
 import math
+import numpy as np
 
 
 # ============================================================================
@@ -65,61 +72,171 @@ class SimpleGrid:
     
     def __init__(self, size):
         self.size = size
-        self.cells = [[0] * size for _ in range(size)]
+        # Zusammenhängendes uint8-Array (1 Byte pro Zelle), Zugriff über cells[y, x]
+        self.cells = np.zeros((size, size), dtype=np.uint8)
+        self._neighbor_counts = np.zeros((size, size), dtype=np.uint8)  # Inkrementell in set()
+        self._light_distances = None  # Cache der Licht-Distanzen, None = veraltet
+        self._alive_count = 0         # Inkrementell gepflegt in set()
+        
+        # Bitset pro Zeile: Bit x von row_bits[y] = Zelle (x, y) belegt
+        self.row_bits = [0] * size
+        # Frontier ebenfalls als Bitset pro Zeile, inkrementell in set() gepflegt
+        self.frontier_bits = [0] * size
+        
+        # Nachbar-Tabelle einmal aufbauen: _neighbors[y][x] = Liste der 4-Nachbarn im Grid
+        directions = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+        self._neighbors = [
+            [
+                [(x + dx, y + dy) for dx, dy in directions
+                 if 0 <= x + dx < size and 0 <= y + dy < size]
+                for x in range(size)
+            ]
+            for y in range(size)
+        ]
+    
+    def reset(self):
+        """Leert das Grid für einen neuen Durchlauf (Nachbar-Tabelle bleibt)"""
+        self.cells.fill(0)
+        self._neighbor_counts.fill(0)
+        self._light_distances = None
+        self._alive_count = 0
+        self.row_bits = [0] * self.size
+        self.frontier_bits = [0] * self.size
     
     def get(self, x, y):
         """Gibt Zellenwert zurück (0 = leer, 1 = belegt)"""
         if self.in_bounds(x, y):
-            return self.cells[y][x]
+            return (self.row_bits[y] >> x) & 1
         return 0
     
     def set(self, x, y, value):
-        """Setzt Zellenwert"""
-        if self.in_bounds(x, y):
-            self.cells[y][x] = value
+        """Setzt Zellenwert
+        
+        Hält Zellenanzahl, 4-Nachbar-Summen, Zeilen-Bitsets und Frontier
+        inkrementell aktuell: nur die Zelle und ihre 4-Nachbarn werden angepasst.
+        """
+        if not self.in_bounds(x, y):
+            return
+        if self.cells[y, x] == value:
+            return
+        
+        self.cells[y, x] = value
+        self._light_distances = None
+        
+        cells = self.cells
+        neighbor_counts = self._neighbor_counts
+        frontier_bits = self.frontier_bits
+        if value:
+            # 0 → 1: Zelle verlässt die Frontier, leere Nachbarn kommen dazu
+            self._alive_count += 1
+            self.row_bits[y] |= 1 << x
+            frontier_bits[y] &= ~(1 << x)
+            for nx, ny in self._neighbors[y][x]:
+                neighbor_counts[ny, nx] += 1
+                if cells[ny, nx] == 0:
+                    frontier_bits[ny] |= 1 << nx
+        else:
+            # 1 → 0: Leere Nachbarn ohne weiteren belegten Nachbarn fallen heraus
+            self._alive_count -= 1
+            self.row_bits[y] &= ~(1 << x)
+            for nx, ny in self._neighbors[y][x]:
+                neighbor_counts[ny, nx] -= 1
+                if cells[ny, nx] == 0 and neighbor_counts[ny, nx] == 0:
+                    frontier_bits[ny] &= ~(1 << nx)
+            if neighbor_counts[y, x]:
+                frontier_bits[y] |= 1 << x
     
     def in_bounds(self, x, y):
         """Prüft ob Koordinaten im Grid liegen"""
         return 0 <= x < self.size and 0 <= y < self.size
     
     def is_empty(self, x, y):
-        """Prüft ob Zelle leer ist"""
-        return self.in_bounds(x, y) and self.cells[y][x] == 0
+        """Prüft ob Zelle leer ist (Bit-Test im Zeilen-Bitset)"""
+        return self.in_bounds(x, y) and not (self.row_bits[y] >> x) & 1
     
     def is_alive(self, x, y):
-        """Prüft ob Zelle belegt ist"""
-        return self.in_bounds(x, y) and self.cells[y][x] == 1
+        """Prüft ob Zelle belegt ist (Bit-Test im Zeilen-Bitset)"""
+        return self.in_bounds(x, y) and bool((self.row_bits[y] >> x) & 1)
     
     def count_alive(self):
-        """Zählt alle belegten Zellen"""
-        return sum(sum(row) for row in self.cells)
+        """Gibt Anzahl belegter Zellen zurück (Zähler, kein Scan)"""
+        return self._alive_count
     
     def get_neighbors_4(self, x, y):
-        """Gibt 4-Nachbarn zurück (N, S, E, W)"""
-        neighbors = []
-        for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
-            nx, ny = x + dx, y + dy
-            if self.in_bounds(nx, ny):
-                neighbors.append((nx, ny))
-        return neighbors
+        """Gibt 4-Nachbarn zurück (N, S, E, W)
+        
+        Liefert die vorberechnete Liste aus der Nachbar-Tabelle - nicht verändern!
+        """
+        if self.in_bounds(x, y):
+            return self._neighbors[y][x]
+        return []
     
     def count_alive_neighbors(self, x, y):
-        """Zählt lebende 4-Nachbarn"""
-        count = 0
-        for nx, ny in self.get_neighbors_4(x, y):
-            if self.is_alive(nx, ny):
-                count += 1
-        return count
+        """Zählt lebende 4-Nachbarn (aus den inkrementell gepflegten Summen)"""
+        if self.in_bounds(x, y):
+            return int(self._neighbor_counts[y, x])
+        return 0
+    
+    def get_neighbor_counts(self):
+        """Gibt Array mit der Anzahl lebender 4-Nachbarn pro Zelle zurück
+        
+        Wird in set() bei jeder Änderung an den 4 Nachbarn um ±1 angepasst,
+        daher ohne Neuberechnung (nicht verändern!).
+        """
+        return self._neighbor_counts
+    
+    def get_light_distances(self):
+        """Gibt Array mit der Licht-Distanz pro Zelle zurück
+        
+        Licht-Distanz = kleinste Anzahl Schritte in eine der 4 Richtungen
+        (N/S/E/W) bis zur ersten freien Zelle. Außerhalb des Grids zählt als
+        frei. Die Zelle selbst wird dabei nicht betrachtet, der Wert gilt also
+        auch für eine leere Kandidatenzelle so als wäre sie belegt.
+        
+        Einmal pro Grid-Zustand berechnet statt pro Kandidat 4 Strahlen
+        abzulaufen: je Richtung ein Prefix-Scan (np.maximum.accumulate) über
+        den Index der letzten freien Zelle.
+        """
+        if self._light_distances is None:
+            empty = self.cells == 0
+            
+            # Jede Richtung als "nach links schauen" auf gespiegelter/transponierter Ansicht
+            west = self._distance_to_free_left(empty)
+            east = self._distance_to_free_left(empty[:, ::-1])[:, ::-1]
+            north = self._distance_to_free_left(empty.T).T
+            south = self._distance_to_free_left(empty[::-1, :].T).T[::-1, :]
+            
+            self._light_distances = np.minimum(np.minimum(west, east), np.minimum(north, south))
+        return self._light_distances
+    
+    @staticmethod
+    def _distance_to_free_left(empty):
+        """Schritte nach links bis zur ersten freien Zelle, pro Zelle
+        
+        Prefix-Maximum über den Spaltenindex freier Zellen liefert die letzte
+        freie Spalte bis einschließlich i; -1 steht für den Rand (frei).
+        Die Zelle selbst zählt nicht, daher wird um eine Spalte verschoben.
+        """
+        rows, cols = empty.shape
+        index = np.arange(cols)
+        last_free = np.maximum.accumulate(np.where(empty, index, -1), axis=1)
+        distance = np.empty((rows, cols), dtype=np.int64)
+        distance[:, 0] = 1
+        distance[:, 1:] = index[1:] - last_free[:, :-1]
+        return distance
     
     def get_frontier_cells(self):
-        """Findet alle leeren Zellen die an belegte Zellen angrenzen"""
+        """Gibt alle leeren Zellen zurück die an belegte Zellen angrenzen
+        
+        Die Frontier-Bits werden in set() gepflegt, hier werden nur die
+        gesetzten Bits abgelaufen.
+        """
         frontier = []
-        for y in range(self.size):
-            for x in range(self.size):
-                if self.is_empty(x, y):
-                    # Prüfe ob mindestens ein Nachbar belegt ist
-                    if self.count_alive_neighbors(x, y) > 0:
-                        frontier.append((x, y))
+        for y, mask in enumerate(self.frontier_bits):
+            while mask:
+                lowest = mask & -mask
+                frontier.append((lowest.bit_length() - 1, y))
+                mask ^= lowest
         return frontier
 
 
@@ -130,13 +247,37 @@ class SimpleGrid:
 class DriverManager:
     """Verwaltet die 3 Driver und berechnet Scores"""
     
+    # Ein Bit pro Driver in self.flags
+    LIGHT = 1 << 0
+    ATTRACTOR = 1 << 1
+    CONNECTED = 1 << 2
+    FLAG_BITS = {'light': LIGHT, 'attractor': ATTRACTOR, 'connected': CONNECTED}
+    
     def __init__(self, config):
         self.config = config
-        self.drivers = {
-            'light': False,
-            'attractor': False,
-            'connected': False
-        }
+        # Maximale Distanz im Grid (Diagonale) - konstant, daher nur einmal berechnet
+        self._max_attractor_distance = math.sqrt(2 * config.GRID_SIZE * config.GRID_SIZE)
+        # Config-Werte einmal binden statt pro Zelle über self.config nachzuschlagen
+        self._grid_size_f = float(config.GRID_SIZE)
+        self._attractor_x = config.ATTRACTOR_X
+        self._attractor_y = config.ATTRACTOR_Y
+        self._weight_light = config.WEIGHT_LIGHT
+        self._weight_attractor = config.WEIGHT_ATTRACTOR
+        self._weight_connected = config.WEIGHT_CONNECTED
+        
+        # Light- und Attractor-Score hängen nur von (x, y) ab: einmal als
+        # Tabelle über das ganze Grid berechnen, Zugriff über table[y, x]
+        size = config.GRID_SIZE
+        ys, xs = np.mgrid[0:size, 0:size]
+        self._light_table = (xs + ys) / (2.0 * self._grid_size_f)
+        if self._max_attractor_distance == 0:
+            self._attractor_table = np.ones((size, size))
+        else:
+            distances = np.hypot(xs - self._attractor_x, ys - self._attractor_y)
+            self._attractor_table = 1.0 - distances / self._max_attractor_distance
+        
+        self.flags = 0  # Bitmaske der aktiven Driver
+        self._static_scores = None  # Gewichtete Summe light + attractor pro Zelle
     
     def set_active_drivers(self, active_list):
         """Setzt welche Driver aktiv sind
@@ -144,14 +285,26 @@ class DriverManager:
         Args:
             active_list: Liste mit Namen der aktiven Driver z.B. ['light', 'attractor']
         """
-        # Alle deaktivieren
-        for key in self.drivers:
-            self.drivers[key] = False
-        
-        # Gewählte aktivieren
+        # Alle deaktivieren, dann gewählte Bits setzen
+        self.flags = 0
         for driver_name in active_list:
-            if driver_name in self.drivers:
-                self.drivers[driver_name] = True
+            self.flags |= self.FLAG_BITS.get(driver_name, 0)
+        
+        self._build_static_scores()
+    
+    def _build_static_scores(self):
+        """Fasst die statischen Driver zu einer gewichteten Tabelle zusammen
+        
+        Light und Attractor hängen nur von (x, y) ab und die Driver-Auswahl
+        ist für einen ganzen Lauf fest: einmal summieren, danach braucht jeder
+        Score nur noch einen Zugriff dafür.
+        """
+        static = np.zeros_like(self._light_table)
+        if self.flags & self.LIGHT:
+            static += self._light_table * self._weight_light
+        if self.flags & self.ATTRACTOR:
+            static += self._attractor_table * self._weight_attractor
+        self._static_scores = static
     
     def calculate_score(self, grid, x, y):
         """Berechnet Gesamt-Score für eine Zelle basierend auf aktiven Drivern
@@ -163,56 +316,39 @@ class DriverManager:
         Returns:
             float: Gesamt-Score (höher = besser)
         """
-        score = 0.0
-        
-        # Driver 1: light - Licht-Score (Wachstum Richtung Süd-Ost)
-        if self.drivers['light']:
-            light_score = self._calculate_light_score(x, y)
-            score += light_score * self.config.WEIGHT_LIGHT
+        if self._static_scores is None:
+            self._build_static_scores()
         
-        # Driver 2: attractor - Growth Point bei (40, 40)
-        if self.drivers['attractor']:
-            attractor_score = self._calculate_attractor_score(x, y)
-            score += attractor_score * self.config.WEIGHT_ATTRACTOR
+        # Driver 1 + 2: gewichtete Tabelle
+        score = float(self._static_scores[y, x])
         
         # Driver 3: connected - Verbindungs-Bonus (kompakte Formen)
-        if self.drivers['connected']:
-            connected_score = self._calculate_connected_score(grid, x, y)
-            score += connected_score * self.config.WEIGHT_CONNECTED
-        
+        if self.flags & self.CONNECTED:
+            score += grid.count_alive_neighbors(x, y) / 4.0 * self._weight_connected
         return score
     
-    def _calculate_light_score(self, x, y):
-        """Berechnet Licht-Score (Wachstum Richtung Süd-Ost)
+    def calculate_scores_batch(self, grid, xs, ys):
+        """Berechnet Scores für viele Zellen auf einmal (vektorisiert)
         
-        Süd-Ost bedeutet: höherer x und höherer y ist besser
+        Args:
+            grid: Das SimpleGrid
+            xs, ys: NumPy-Arrays mit den Positionen der zu bewertenden Zellen
+            
+        Returns:
+            np.ndarray: Gesamt-Score pro Zelle (float64)
         """
-        # Normalisierte Distanz zur Süd-Ost-Ecke
-        dist_x = x / float(self.config.GRID_SIZE)
-        dist_y = y / float(self.config.GRID_SIZE)
-        
-        # Je näher an Süd-Ost, desto höher der Score
-        return (dist_x + dist_y) / 2.0
-    
-    def _calculate_attractor_score(self, x, y):
-        """Berechnet Attractor-Score (Nähe zu Growth Point bei (40, 40))"""
-        dx = x - self.config.ATTRACTOR_X
-        dy = y - self.config.ATTRACTOR_Y
-        distance = math.sqrt(dx * dx + dy * dy)
-        
-        # Je näher am Attractor, desto höher der Score
-        # Maximum Score bei Distanz 0, fällt ab mit Distanz
-        max_distance = math.sqrt(2 * self.config.GRID_SIZE * self.config.GRID_SIZE)
-        if max_distance == 0:
-            return 1.0
-        
-        return 1.0 - (distance / max_distance)
-    
-    def _calculate_connected_score(self, grid, x, y):
-        """Berechnet Connected-Score (Bonus für viele Nachbarn)"""
-        # Je mehr lebende Nachbarn, desto höher der Score
-        alive_neighbors = grid.count_alive_neighbors(x, y)
-        return alive_neighbors / 4.0  # Normalisiert auf 0-1
+        xs = np.asarray(xs)
+        ys = np.asarray(ys)
+        if self._static_scores is None:
+            self._build_static_scores()
+        
+        # Driver 1 + 2: ein Zugriff in die vorab gewichtete Tabelle
+        scores = self._static_scores[ys, xs]
+        
+        # Driver 3: connected - nutzt die gecachten Nachbar-Summen des Grids
+        if self.flags & self.CONNECTED:
+            scores = scores + grid.get_neighbor_counts()[ys, xs] / 4.0 * self._weight_connected
+        return scores
 
 
 # ============================================================================
@@ -222,13 +358,38 @@ class DriverManager:
 class StopperManager:
     """Verwaltet die 3 Stopper und prüft ob Zellen erlaubt sind"""
     
+    # Ein Bit pro Stopper in self.flags
+    BOUNDARY = 1 << 0
+    MIN_WIDTH = 1 << 1
+    LIGHT_DISTANCE = 1 << 2
+    FLAG_BITS = {'boundary': BOUNDARY, 'min_width': MIN_WIDTH, 'light_distance': LIGHT_DISTANCE}
+    
     def __init__(self, config):
         self.config = config
-        self.stoppers = {
-            'boundary': False,
-            'min_width': False,
-            'light_distance': False
-        }
+        # Config-Werte einmal binden statt pro Prüfung über self.config nachzuschlagen
+        self._boundary_size = config.BOUNDARY_SIZE
+        self._max_light_distance = config.MAX_LIGHT_DISTANCE
+        self.flags = 0  # Bitmaske der aktiven Stopper
+        # Vorberechnete Maske (boundary_mask[y, x] = True wenn innerhalb), siehe build_masks
+        self.boundary_mask = None
+    
+    def build_masks(self, start_x, start_y, grid_size):
+        """Berechnet die Boundary-Maske einmal pro Simulation vor
+        
+        Die Boundary hängt nur von der Startposition ab, daher wird die
+        Rechteck-Prüfung einmal für das ganze Grid ausgewertet. Danach ist
+        jede Prüfung ein einzelner Array-Zugriff (auch für ganze Frontier-Arrays).
+        
+        Args:
+            start_x, start_y: Start-Position (Mitte der Boundary)
+            grid_size: Kantenlänge des Grids
+        """
+        size = self._boundary_size
+        mask = np.zeros((grid_size, grid_size), dtype=bool)
+        # Rechteck per Slice setzen (Grenzen auf >= 0 klemmen, oben schneidet NumPy ab)
+        mask[max(start_y - size, 0):max(start_y + size + 1, 0),
+             max(start_x - size, 0):max(start_x + size + 1, 0)] = True
+        self.boundary_mask = mask
     
     def set_active_stoppers(self, active_list):
         """Setzt welche Stopper aktiv sind
@@ -236,14 +397,10 @@ class StopperManager:
         Args:
             active_list: Liste mit Namen der aktiven Stopper z.B. ['boundary', 'min_width']
         """
-        # Alle deaktivieren
-        for key in self.stoppers:
-            self.stoppers[key] = False
-        
-        # Gewählte aktivieren
+        # Alle deaktivieren, dann gewählte Bits setzen
+        self.flags = 0
         for stopper_name in active_list:
-            if stopper_name in self.stoppers:
-                self.stoppers[stopper_name] = True
+            self.flags |= self.FLAG_BITS.get(stopper_name, 0)
     
     def is_allowed(self, grid, x, y, start_x, start_y):
         """Prüft ob eine Zelle platziert werden darf
@@ -256,34 +413,50 @@ class StopperManager:
         Returns:
             bool: True wenn erlaubt, False wenn blockiert
         """
-        # Stopper 1: boundary - Grundstücksgrenze (Kreis mit Radius 6 um Mitte)
-        if self.stoppers['boundary']:
-            if not self._check_boundary(x, y, start_x, start_y):
-                return False
+        # Dieselben Regeln wie für die ganze Frontier, für einen Kandidaten
+        ok = self.filter_frontier(grid, np.array([x]), np.array([y]), start_x, start_y)
+        return bool(ok[0])
+    
+    def filter_frontier(self, grid, xs, ys, start_x, start_y):
+        """Prüft alle Kandidaten auf einmal gegen die aktiven Stopper
         
-        # Stopper 2: min_width - Mindestbreite (mind. 2 Zellen breit)
-        if self.stoppers['min_width']:
-            if not self._check_min_width(grid, x, y):
-                return False
+        Einzige Umsetzung der Stopper-Regeln (is_allowed ruft sie für eine
+        Zelle auf). Günstigste Prüfung zuerst: boundary ist ein Array-Zugriff,
+        light_distance und min_width lesen Masken über das ganze Grid.
         
-        # Stopper 3: light_distance - Licht-Abstand (max. 3 Zellen vom Rand)
-        if self.stoppers['light_distance']:
-            if not self._check_light_distance(grid, x, y):
-                return False
+        Args:
+            grid: Das SimpleGrid
+            xs, ys: NumPy-Arrays mit den Positionen der Kandidaten
+            start_x, start_y: Start-Position (Mitte)
+            
+        Returns:
+            np.ndarray: Bool-Maske, True wenn Kandidat erlaubt
+        """
+        ok = np.ones(len(xs), dtype=bool)
         
-        return True
-    
-    def _check_boundary(self, x, y, center_x, center_y):
-        """Prüft ob Zelle innerhalb der Boundary ist (RECHTECK)"""
-        dx = abs(x - center_x)
-        dy = abs(y - center_y)
+        # Stopper 1: boundary - ein Array-Zugriff pro Kandidat
+        if self.flags & self.BOUNDARY:
+            if self.boundary_mask is None:
+                self.build_masks(start_x, start_y, grid.size)
+            ok &= self.boundary_mask[ys, xs]
+            if not ok.any():
+                return ok
+        
+        # Stopper 3: light_distance - Licht-Abstand: in mindestens einer der
+        # 4 Richtungen ist nach max. MAX_LIGHT_DISTANCE Zellen eine freie Zelle
+        # (vorberechnete Licht-Distanzen, SimpleGrid.get_light_distances)
+        if self.flags & self.LIGHT_DISTANCE:
+            ok &= grid.get_light_distances()[ys, xs] <= self._max_light_distance
+        
+        # Stopper 2: min_width - über die vorberechnete Mindestbreiten-Maske
+        if self.flags & self.MIN_WIDTH:
+            ok &= self._min_width_mask(grid)[ys, xs]
         
-        # Rechteck-Prüfung: Innerhalb von BOUNDARY_SIZE in beide Richtungen
-        return dx <= self.config.BOUNDARY_SIZE and dy <= self.config.BOUNDARY_SIZE
+        return ok
     
-    def _check_min_width(self, grid, x, y):
+    def _min_width_mask(self, grid):
         """
-        Prüfung für Mindestbreite von 2 Zellen.
+        Prüfung für Mindestbreite von 2 Zellen, für alle Zellen des Grids.
         
         BOOTSTRAP-PHASE: Bei weniger als 4 Zellen wird Wachstum erlaubt,
         um eine 2×2 Basis zu bilden. Danach greift die normale Prüfung.
@@ -300,113 +473,40 @@ class StopperManager:
         ●
         ■
         (Hier ist ● nur 1 breit weil links/rechts nichts ist)
-        """
         
-        # Bootstrap-Phase: Erlaube Wachstum bis 4 Zellen existieren
-        # Damit kann sich eine 2×2 Basis bilden
-        alive_count = grid.count_alive()
-        if alive_count < 4:
-            return True  # Erlaube Wachstum während Bootstrap
-        
-        # Ab hier: Normale Mindestbreiten-Prüfung
-        # Prüfe: Hat die Zelle einen Nachbarn UND hat dieser Nachbar 
-        # oder die Zelle selbst einen parallelen Nachbarn?
-        
-        # Horizontale Nachbarn prüfen
-        has_left = grid.is_alive(x - 1, y)
-        has_right = grid.is_alive(x + 1, y)
-        
-        # Vertikale Nachbarn prüfen  
-        has_up = grid.is_alive(x, y - 1)
-        has_down = grid.is_alive(x, y + 1)
-        
-        # Fall 1: Horizontal 2 breit - links ODER rechts ist belegt
-        if has_left or has_right:
-            # Prüfe ob diese horizontale Verbindung "breit" ist
-            # D.h. die Zelle oder der Nachbar hat noch einen parallelen Nachbarn
-            
-            if has_left:
-                # Ist links-oben oder links-unten auch belegt? Oder oben/unten von mir?
-                if grid.is_alive(x - 1, y - 1) or grid.is_alive(x - 1, y + 1):
-                    return True
-                if has_up or has_down:
-                    return True
-            
-            if has_right:
-                # Ist rechts-oben oder rechts-unten auch belegt? Oder oben/unten von mir?
-                if grid.is_alive(x + 1, y - 1) or grid.is_alive(x + 1, y + 1):
-                    return True
-                if has_up or has_down:
-                    return True
-        
-        # Fall 2: Vertikal 2 breit - oben ODER unten ist belegt
-        if has_up or has_down:
-            if has_up:
-                # Ist oben-links oder oben-rechts auch belegt? Oder links/rechts von mir?
-                if grid.is_alive(x - 1, y - 1) or grid.is_alive(x + 1, y - 1):
-                    return True
-                if has_left or has_right:
-                    return True
-            
-            if has_down:
-                # Ist unten-links oder unten-rechts auch belegt? Oder links/rechts von mir?
-                if grid.is_alive(x - 1, y + 1) or grid.is_alive(x + 1, y + 1):
-                    return True
-                if has_left or has_right:
-                    return True
+        Die Nachbarschaft (4 direkte + 4 diagonale Nachbarn) wird über
+        verschobene Ansichten eines mit 0 aufgefüllten Arrays gelesen,
+        die Fallunterscheidung wird zu Bool-Arithmetik.
         
-        # Keine 2-breite Struktur möglich
-        return False
-    
-    def _check_light_distance(self, grid, x, y):
+        Returns:
+            np.ndarray: Bool-Maske [y, x], True wenn Mindestbreite erfüllt
         """
-        Prüft ob in mindestens EINER der 4 Richtungen (N/S/E/W)
-        nach max. X Zellen eine FREIE Zelle ist.
+        size = grid.size
         
-        Beispiel mit MAX_LIGHT_DISTANCE = 3:
-        - Schau nach Norden: Ist nach 1, 2, oder 3 Zellen eine freie Zelle? 
-        - Schau nach Süden: Ist nach 1, 2, oder 3 Zellen eine freie Zelle?
-        - Schau nach Osten: ...
-        - Schau nach Westen: ...
+        # Bootstrap-Phase: Erlaube Wachstum bis 4 Zellen existieren
+        if grid.count_alive() < 4:
+            return np.ones((size, size), dtype=bool)
         
-        Wenn MINDESTENS EINE Richtung innerhalb von 3 Zellen frei ist → erlaubt
-        Wenn ALLE 4 Richtungen nach 3 Zellen immer noch blockiert sind → blockiert
-        """
-        max_dist = self.config.MAX_LIGHT_DISTANCE  # z.B. 3 oder 4
+        padded = np.zeros((size + 2, size + 2), dtype=bool)
+        padded[1:-1, 1:-1] = grid.cells
         
-        # Temporär setzen um zu prüfen wie es aussehen würde
-        grid.set(x, y, 1)
+        def shifted(dx, dy):
+            return padded[1 + dy:size + 1 + dy, 1 + dx:size + 1 + dx]
         
-        # 4 Richtungen prüfen (von Neumann Nachbarschaft)
-        directions = [(1, 0), (-1, 0), (0, 1), (0, -1)]
-        
-        found_free = False
-        
-        for dx, dy in directions:
-            # In diese Richtung schauen
-            for dist in range(1, max_dist + 1):
-                check_x = x + (dx * dist)
-                check_y = y + (dy * dist)
-                
-                # Außerhalb Grid = frei (Licht kommt von außen rein)
-                if not grid.in_bounds(check_x, check_y):
-                    found_free = True
-                    break
-                
-                # Leere Zelle gefunden = Licht kommt durch
-                if grid.is_empty(check_x, check_y):
-                    found_free = True
-                    break
-                
-                # Belegte Zelle → weiter schauen in diese Richtung
-            
-            if found_free:
-                break
+        has_left, has_right = shifted(-1, 0), shifted(1, 0)
+        has_up, has_down = shifted(0, -1), shifted(0, 1)
+        up_left, up_right = shifted(-1, -1), shifted(1, -1)
+        down_left, down_right = shifted(-1, 1), shifted(1, 1)
         
-        # Zurücksetzen
-        grid.set(x, y, 0)
+        vertical = has_up | has_down
+        horizontal = has_left | has_right
         
-        return found_free
+        return (
+            (has_left & (up_left | down_left | vertical)) |
+            (has_right & (up_right | down_right | vertical)) |
+            (has_up & (up_left | up_right | horizontal)) |
+            (has_down & (down_left | down_right | horizontal))
+        )
 
 
 # ============================================================================
@@ -419,7 +519,7 @@ class Visualizer:
     def __init__(self, config):
         self.config = config
         self.layer_name = "AnalysisSimulation"
-        self.boxes = []
+        self._cell_size = config.CELL_SIZE  # Einmal binden, _make_box läuft pro Zelle
     
     def ensure_layer(self):
         """Erstellt Layer falls nicht vorhanden"""
@@ -428,10 +528,17 @@ class Visualizer:
         return self.layer_name
     
     def clear(self):
-        """Löscht alle Boxen"""
-        if self.boxes:
-            rs.DeleteObjects(self.boxes)
-        self.boxes = []
+        """Löscht alle Boxen
+        
+        Holt alle Objekte des Simulations-Layers auf einmal und löscht sie in
+        einem Aufruf (erwischt auch Reste aus früheren Läufen).
+        """
+        if rs.IsLayer(self.layer_name):
+            object_ids = rs.ObjectsByLayer(self.layer_name)
+            if object_ids:
+                rs.EnableRedraw(False)
+                rs.DeleteObjects(object_ids)
+                rs.EnableRedraw(True)
     
     def draw_grid(self, grid, start_x, start_y, show_attractor=False, show_boundary=False):
         """Zeichnet das Grid als 3D-Boxen
@@ -445,64 +552,63 @@ class Visualizer:
         self.ensure_layer()
         rs.EnableRedraw(False)
         
-        # Grid-Boxen zeichnen
-        for y in range(grid.size):
-            for x in range(grid.size):
-                if grid.is_alive(x, y):
-                    # Farbe bestimmen
-                    if x == start_x and y == start_y:
-                        color = self.config.COLOR_START  # Gold für Startzelle
-                    else:
-                        color = self.config.COLOR_NORMAL  # Grün für normale Zellen
-                    
-                    box = self._make_box(x, y, color)
-                    if box:
-                        self.boxes.append(box)
+        # Grid-Boxen zeichnen: Geometrie direkt in RhinoCommon bauen und mit
+        # geteilten Attributen pro Farbe hinzufügen (kein rs-Aufruf pro Box)
+        start_attributes = self._make_attributes(self.config.COLOR_START)    # Gold
+        normal_attributes = self._make_attributes(self.config.COLOR_NORMAL)  # Grün
+        
+        # Nur belegte Zellen ablaufen statt das ganze Grid
+        alive_ys, alive_xs = np.nonzero(grid.cells)
+        for x, y in zip(alive_xs.tolist(), alive_ys.tolist()):
+            # Farbe bestimmen
+            if x == start_x and y == start_y:
+                attributes = start_attributes  # Gold für Startzelle
+            else:
+                attributes = normal_attributes  # Grün für normale Zellen
+            
+            self._make_box(x, y, attributes)
         
         # Attractor-Marker (wenn aktiv)
         if show_attractor:
-            marker = self._make_marker(
+            self._make_marker(
                 self.config.ATTRACTOR_X,
                 self.config.ATTRACTOR_Y,
                 self.config.COLOR_ATTRACTOR
             )
-            if marker:
-                self.boxes.append(marker)
         
         # Boundary-Rechteck (wenn aktiv)
         if show_boundary:
-            rectangle = self._make_boundary_rectangle(start_x, start_y)
-            if rectangle:
-                self.boxes.append(rectangle)
+            self._make_boundary_rectangle(start_x, start_y)
         
         rs.EnableRedraw(True)
+        sc.doc.Views.Redraw()
+    
+    def _make_attributes(self, color):
+        """Erstellt Objekt-Attribute (Layer + Farbe) zum Teilen über viele Boxen"""
+        attributes = Rhino.DocObjects.ObjectAttributes()
+        attributes.LayerIndex = sc.doc.Layers.FindByFullPath(self.layer_name, -1)
+        attributes.ColorSource = Rhino.DocObjects.ObjectColorSource.ColorFromObject
+        attributes.ObjectColor = System.Drawing.Color.FromArgb(color[0], color[1], color[2])
+        return attributes
     
-    def _make_box(self, x, y, color):
+    def _make_box(self, x, y, attributes):
         """Erstellt eine Box für eine Zelle"""
-        cell = self.config.CELL_SIZE
+        cell = self._cell_size
         
         x0 = x * cell
         y0 = y * cell
-        z0 = 0
-        z1 = cell
-        
-        corners = [
-            (x0, y0, z0),
-            (x0 + cell, y0, z0),
-            (x0 + cell, y0 + cell, z0),
-            (x0, y0 + cell, z0),
-            (x0, y0, z1),
-            (x0 + cell, y0, z1),
-            (x0 + cell, y0 + cell, z1),
-            (x0, y0 + cell, z1)
-        ]
+        
+        box = rg.Box(
+            rg.Plane.WorldXY,
+            rg.Interval(x0, x0 + cell),
+            rg.Interval(y0, y0 + cell),
+            rg.Interval(0, cell)
+        )
         
         try:
-            box = rs.AddBox(corners)
-            if box:
-                rs.ObjectColor(box, color)
-                rs.ObjectLayer(box, self.layer_name)
-                return box
+            box_id = sc.doc.Objects.AddBox(box, attributes)
+            if box_id != System.Guid.Empty:
+                return box_id
         except:
             pass
         
@@ -565,10 +671,15 @@ class AnalysisSimulation:
     
     def __init__(self):
         self.config = Config()
-        self.grid = None
-        self.driver_manager = None
-        self.stopper_manager = None
-        self.visualizer = None
+        # Einmal anlegen: Tabellen, Masken und Nachbar-Tabelle bleiben über
+        # alle Durchläufe erhalten, pro Lauf wird nur das Grid zurückgesetzt
+        self.grid = SimpleGrid(self.config.GRID_SIZE)
+        self.driver_manager = DriverManager(self.config)
+        self.stopper_manager = StopperManager(self.config)
+        self.stopper_manager.build_masks(
+            self.config.START_X, self.config.START_Y, self.config.GRID_SIZE
+        )
+        self.visualizer = Visualizer(self.config)
     
     def run(self):
         """Führt die Simulation aus mit interaktiver Auswahl"""
@@ -578,11 +689,8 @@ class AnalysisSimulation:
             print("ANALYSIS SIMULATION - Vereinfachte Version")
             print("=" * 60)
             
-            # Initialisierung
-            self.grid = SimpleGrid(self.config.GRID_SIZE)
-            self.driver_manager = DriverManager(self.config)
-            self.stopper_manager = StopperManager(self.config)
-            self.visualizer = Visualizer(self.config)
+            # Initialisierung (Manager aus __init__ wiederverwenden)
+            self.grid.reset()
             
             # Startzelle setzen
             start_x = self.config.START_X
@@ -699,12 +807,17 @@ class AnalysisSimulation:
     
     def _run_growth(self):
         """Führt das Wachstum aus bis MAX_ITERATIONS erreicht sind oder keine Kandidaten mehr vorhanden"""
-        start_x = self.config.START_X
-        start_y = self.config.START_Y
+        config = self.config
+        start_x = config.START_X
+        start_y = config.START_Y
+        max_iterations = config.MAX_ITERATIONS
+        pool_size = config.TOP_CANDIDATES_POOL
+        cells_max = config.CELLS_PER_ITERATION_MAX
+        cells_min = config.CELLS_PER_ITERATION_MIN
         
         iterations = 0
         
-        while iterations < self.config.MAX_ITERATIONS:
+        while iterations < max_iterations:
             # Finde Frontier-Zellen (leere Zellen die an belegte angrenzen)
             frontier = self.grid.get_frontier_cells()
             
@@ -712,69 +825,60 @@ class AnalysisSimulation:
                 print("Keine Frontier-Zellen mehr verfügbar")
                 break
             
-            # Score alle Kandidaten
-            scored_candidates = []
-            for (x, y) in frontier:
-                # Prüfe ob erlaubt (Stopper)
-                if not self.stopper_manager.is_allowed(self.grid, x, y, start_x, start_y):
-                    continue
-                
-                # Berechne Score (Driver)
-                score = self.driver_manager.calculate_score(self.grid, x, y)
-                scored_candidates.append(((x, y), score))
+            # Stopper und Driver für alle Kandidaten auf einmal
+            xs = np.array([x for x, _ in frontier])
+            ys = np.array([y for _, y in frontier])
+            xs, ys, scores = self._evaluate_frontier(xs, ys, start_x, start_y)
             
-            if not scored_candidates:
+            if len(xs) == 0:
                 print("Keine gültigen Kandidaten mehr (alle von Stoppern blockiert)")
                 break
             
-            # Sortiere nach Score (höchster zuerst)
-            scored_candidates.sort(key=lambda item: item[1], reverse=True)
-            
-            # Top-10 Kandidaten für Auswahl
-            top_count = min(self.config.TOP_CANDIDATES_POOL, len(scored_candidates))
-            top_candidates = scored_candidates[:top_count]
+            # Top-10 Kandidaten für Auswahl: Schwellwert per partition statt
+            # kompletter Sortierung. Bei Gleichstand gewinnen wie bei der
+            # stabilen Sortierung die Kandidaten mit dem kleinsten Index.
+            top_count = min(pool_size, len(scores))
+            threshold = np.partition(scores, -top_count)[-top_count]
+            above = np.flatnonzero(scores > threshold)
+            tied = np.flatnonzero(scores == threshold)[:top_count - len(above)]
+            top_idx = np.sort(np.concatenate((above, tied)))
+            top_idx = top_idx[np.argsort(-scores[top_idx], kind='stable')]
+            top_xs = xs[top_idx].tolist()
+            top_ys = ys[top_idx].tolist()
+            top_scores = scores[top_idx]
             
             # Zufällige Anzahl: 3 bis 5 (oder weniger wenn nicht genug Kandidaten)
-            max_cells = min(self.config.CELLS_PER_ITERATION_MAX, len(top_candidates))
-            min_cells = min(self.config.CELLS_PER_ITERATION_MIN, max_cells)
+            max_cells = min(cells_max, top_count)
+            min_cells = min(cells_min, max_cells)
             cells_to_grow = random.randint(min_cells, max_cells)
             
-            # Gewichtete Auswahl OHNE Zurücklegen (keine Duplikate)
-            available_candidates = list(top_candidates)  # Kopie für Entfernung
+            # Gewichtete Auswahl OHNE Zurücklegen (keine Duplikate), Gewicht
+            # exp(score): Gumbel-Top-k - Score + Gumbel-Rauschen, die k
+            # größten Schlüssel gewinnen (kein exp, keine Normierung)
+            keys = top_scores + np.random.gumbel(size=top_count)
+            picks = np.argpartition(-keys, cells_to_grow - 1)[:cells_to_grow]
             
-            for _ in range(cells_to_grow):
-                if not available_candidates:
-                    break
-                
-                # Gewichte berechnen
-                weights = [math.exp(score) for (pos, score) in available_candidates]
-                total_weight = sum(weights)
-                
-                if total_weight <= 0:
-                    # Fallback: erste verfügbare Zelle
-                    chosen_idx = 0
-                else:
-                    # Gewichtete Zufallsauswahl
-                    r = random.random() * total_weight
-                    cumulative = 0
-                    chosen_idx = 0
-                    for i, w in enumerate(weights):
-                        cumulative += w
-                        if r <= cumulative:
-                            chosen_idx = i
-                            break
-                
-                # Zelle setzen
-                chosen_pos = available_candidates[chosen_idx][0]
-                self.grid.set(chosen_pos[0], chosen_pos[1], 1)
-                
-                # Aus Pool entfernen (keine Duplikate)
-                available_candidates.pop(chosen_idx)
+            for chosen in picks:
+                self.grid.set(top_xs[chosen], top_ys[chosen], 1)
             
             iterations += 1
         
         final_count = self.grid.count_alive()
         print("Wachstum beendet mit {} Zellen nach {} Iterationen".format(final_count, iterations))
+    
+    def _evaluate_frontier(self, xs, ys, start_x, start_y):
+        """Filtert Kandidaten mit den Stoppern und bewertet die erlaubten
+        
+        Beides läuft über die vektorisierten NumPy-Methoden der Manager.
+        
+        Returns:
+            (xs, ys, scores) der erlaubten Kandidaten
+        """
+        ok = self.stopper_manager.filter_frontier(self.grid, xs, ys, start_x, start_y)
+        xs = xs[ok]
+        ys = ys[ok]
+        scores = self.driver_manager.calculate_scores_batch(self.grid, xs, ys)
+        return xs, ys, scores
 
 
 # ============================================================================
@@ -793,7 +897,7 @@ def main():
         rs.MessageBox("Fehler: {}".format(str(e)), 0, "Fehler")
 
 
+# Nur beim Ausführen als Skript starten (Rhino führt Skripte als __main__ aus);
+# beim Importieren, z.B. zum Profilen, läuft keine Simulation
 if __name__ == "__main__":
     main()
-else:
-    main()
@@ -9,16 +9,41 @@ Komplett überarbeitete Version mit:
 - Durchgehenden Löchern durch alle Ebenen
 - Sanduhr-förmiger Layer-Konfiguration
 
+Benötigt NumPy (Rhino 8 / CPython). Numba ist optional und beschleunigt
+das Scoring der Kandidaten, wenn installiert.
+
 Autor: Überarbeitet für bessere Architektur
 """
 
 import rhinoscriptsyntax as rs
+import scriptcontext as sc
 import Rhino
 import Rhino.Geometry as rg
+import System
 import random
 import math
+import heapq
 import time
+from bisect import bisect_left
 from collections import deque
+from itertools import accumulate
+from operator import itemgetter
+import numpy as np
+
+# Numba ist optional: ohne Numba laufen die Kernel-Funktionen als normales
+# Python und die GrowthEngine bewertet die Frontier mit NumPy.
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+    
+    def njit(*args, **kwargs):
+        """Ersatz für numba.njit - gibt die Funktion unverändert zurück"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
 
 # ============================================================================
 # KONFIGURATION
@@ -30,6 +55,11 @@ class Config:
     # Grid-Einstellungen
     CELL_SIZE = 3.0
     
+    # Speicher-Obergrenze für die Grid-Größe (geschätzt, in MB)
+    MAX_MEMORY_MB = 512
+    BYTES_PER_CELL_SHARED = 200  # Zobrist-Tabelle, Score-Felder, Masken - einmal pro Simulation
+    BYTES_PER_CELL_LAYER = 8     # Pro gespeichertem Layer: Zellen, Bitboard, Nachbarzählung
+    
     # Breiten-Einstellungen für Äste
     MIN_WIDTH = 1              # Minimale Breite (harte Grenze, sollte 1 oder 2 sein)
     PREFERRED_WIDTH = 4        # Bevorzugte Breite für Äste (wird im Scoring verwendet)
@@ -99,11 +129,13 @@ class Config:
     # Wachstum
     MAX_GROW_ATTEMPTS = 2000
     FRONTIER_RADIUS = 2
+    BATCH_GROW_SIZE = 1          # Zellen pro Bewertung der Frontier (1 = nach jeder Zelle neu bewerten)
     
     # Visualisierung
     MAX_VISUAL_BOXES = 25000
     LAYER_NAME = "GrowthSimulation"
-    PAUSE_BETWEEN_LAYERS = 0.1
+    PAUSE_BETWEEN_LAYERS = 0.1   # Sekunden nach jedem Neuzeichnen (0 = keine Pause)
+    REDRAW_EVERY = 1             # Viewport nur jeden n-ten Layer neu zeichnen (letzter immer)
     
     # Licht (Sonnenrichtung)
     SUN_DIRECTION = (0.5, 0.7, 0.8)  # Normalisiert
@@ -175,6 +207,44 @@ class Config:
     DEFAULT_PRESET = "Work"
 
 
+class RuntimeConfig:
+    """
+    Eingefrorene Einstellungen für eine Wachstumsphase: Config-Werte mit
+    dem Funktions-Preset zusammengeführt. Wird einmal pro Layer gebaut,
+    damit das Scoring nur noch Slot-Attribute liest statt Dict-Lookups.
+    """
+    
+    __slots__ = (
+        'LIGHT_DISTANCE', 'MIN_WIDTH', 'PREFERRED_WIDTH', 'MAX_LINE',
+        'WIDTH_SCORE_BONUS', 'BALANCE_BONUS_WEIGHT', 'EDGE_BONUS_SCORE',
+        'EDGE_DISTANCE_THRESHOLD', 'WEIGHT_CONNECTED', 'WEIGHT_SMOOTHNESS',
+        'WEIGHT_CONVEXITY', 'MIN_BRANCH_END_WIDTH', 'MIN_CELLS_FOR_WIDTH_CHECK',
+        'MAX_THIN_FINGER_LENGTH',
+    )
+    
+    # Fallbacks falls ein Wert weder im Preset noch in der Config steht
+    FALLBACKS = {
+        'PREFERRED_WIDTH': 3,
+        'WIDTH_SCORE_BONUS': 2.0,
+        'BALANCE_BONUS_WEIGHT': 0.5,
+        'MIN_BRANCH_END_WIDTH': 2,
+        'MIN_CELLS_FOR_WIDTH_CHECK': 30,
+        'MAX_THIN_FINGER_LENGTH': 2,
+    }
+    
+    def __init__(self, config, preset, function):
+        """Preset hat Priorität über Config"""
+        for key in self.__slots__:
+            if preset and key in preset:
+                value = preset[key]
+            elif key == 'LIGHT_DISTANCE':
+                # Config.LIGHT_DISTANCE ist pro Funktion definiert
+                value = config.LIGHT_DISTANCE.get(function, config.DEFAULT_LIGHT_DISTANCE)
+            else:
+                value = getattr(config, key, self.FALLBACKS.get(key))
+            setattr(self, key, value)
+
+
 # ============================================================================
 # GRID KLASSE
 # ============================================================================
@@ -182,21 +252,128 @@ class Config:
 class Grid:
     """Verwaltet das 2D-Zellengitter für eine Ebene"""
     
+    # Zobrist-Tabellen pro Grid-Größe (geteilt zwischen allen Grids)
+    _zobrist_tables = {}
+    
     def __init__(self, cols, rows):
         self.cols = cols
         self.rows = rows
-        self.cells = [[0] * cols for _ in range(rows)]
+        # Zellen als uint8-Array mit Null-Rand; cells ist die innere Sicht,
+        # damit Nachbarzählungen ohne Grenzprüfung auskommen
+        self._padded = np.zeros((rows + 2, cols + 2), dtype=np.uint8)
+        self.cells = self._padded[1:-1, 1:-1]
+        self._alive = 0  # Zähler lebender Zellen, von set() gepflegt
+        # Bitboard: eine uint64-Wortzeile pro Grid-Zeile, Bit x%64 in Wort x//64
+        self.bits = np.zeros((rows, (cols + 63) // 64), dtype=np.uint64)
+        # Zeilen- und Spaltenmasken als Python-int (Bit x bzw. y) für Lauflängen
+        self._row_bits = [0] * rows
+        self._col_bits = [0] * cols
+        
+        # Inhalts-Hash (Zobrist): set() toggelt einen Zufallswert pro Zelle,
+        # Setzen und Zurücksetzen ergibt wieder denselben Hash
+        self._zobrist = Grid._zobrist_table(cols, rows)
+        self.content_hash = 0
+        self._component_cache = {}  # (content_hash, x, y) -> frozenset
+        
+        # Anzahl lebender Zellen im Frontier-Radius, lazy in near_counts()
+        self._near_counts = None
+        self._near_radius = 0
+    
+    @staticmethod
+    def _zobrist_table(cols, rows):
+        """Zufallswerte pro Zelle für den Inhalts-Hash"""
+        key = (cols, rows)
+        table = Grid._zobrist_tables.get(key)
+        if table is None:
+            rng = np.random.default_rng(cols * 100003 + rows)
+            table = rng.integers(1, 2**62, size=(rows, cols), dtype=np.int64).tolist()
+            Grid._zobrist_tables[key] = table
+        return table
     
     def get(self, x, y):
         """Gibt Zellenwert zurück (0 = leer, 1 = belegt)"""
         if self.in_bounds(x, y):
-            return self.cells[y][x]
+            return int(self.cells[y, x])
         return 0
     
     def set(self, x, y, value):
         """Setzt Zellenwert"""
         if self.in_bounds(x, y):
-            self.cells[y][x] = value
+            if self.cells[y, x] == value:
+                return
+            self.cells[y, x] = value
+            self.content_hash ^= self._zobrist[y][x]
+            self._alive += 1 if value else -1
+            self.bits[y, x >> 6] ^= np.uint64(1 << (x & 63))
+            self._row_bits[y] ^= 1 << x
+            self._col_bits[x] ^= 1 << y
+            
+            if self._near_counts is not None:
+                r = self._near_radius
+                window = self._near_counts[max(y - r, 0):y + r + 1, max(x - r, 0):x + r + 1]
+                if value:
+                    window += 1
+                else:
+                    window -= 1
+    
+    def fill_mask(self, mask):
+        """
+        Belegt alle Zellen einer (rows, cols)-Bitmap. Die Auswahl läuft als
+        Array-Operation, set() nur für die noch leeren Zellen.
+        """
+        ys, xs = np.nonzero(mask & (self.cells == 0))
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            self.set(x, y, 1)
+    
+    def clear_mask(self, mask):
+        """
+        Leert alle Zellen einer (rows, cols)-Bitmap. Die Auswahl läuft als
+        Array-Operation, set() nur für die tatsächlich belegten Zellen.
+        """
+        ys, xs = np.nonzero(mask & (self.cells == 1))
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            self.set(x, y, 0)
+    
+    def run_lengths(self, x, y, virtual=None):
+        """
+        Länge des belegten Abschnitts durch (x, y) horizontal und vertikal;
+        (x, y) selbst zählt immer mit. Über die Zeilen-/Spaltenmasken
+        statt Zelle für Zelle. virtual=(vx, vy) zählt als belegt, ohne
+        das Grid zu verändern.
+        
+        Returns: (count_h, count_v)
+        """
+        row_bits = self._row_bits[y]
+        col_bits = self._col_bits[x]
+        if virtual is not None:
+            vx, vy = virtual
+            if vy == y:
+                row_bits |= 1 << vx
+            if vx == x:
+                col_bits |= 1 << vy
+        return (1 + self._run_through(row_bits, x),
+                1 + self._run_through(col_bits, y))
+    
+    @staticmethod
+    def _run_through(bits, i):
+        """Anzahl gesetzter Bits direkt unter- und oberhalb von Bit i"""
+        below = i - (~bits & ((1 << i) - 1)).bit_length()
+        upper = bits >> (i + 1)
+        return below + (upper ^ (upper + 1)).bit_length() - 1
+    
+    def ring_bits(self, x, y):
+        """
+        8er-Ring um (x, y) als Bitmaske, Bit gesetzt = belegt (außerhalb
+        des Grids = leer). Reihenfolge N, NO, O, SO, S, SW, W, NW wie in
+        ring_connected_table.
+        """
+        p = self._padded
+        px = x + 1
+        py = y + 1
+        return (int(p[py - 1, px]) | int(p[py - 1, px + 1]) << 1 |
+                int(p[py, px + 1]) << 2 | int(p[py + 1, px + 1]) << 3 |
+                int(p[py + 1, px]) << 4 | int(p[py + 1, px - 1]) << 5 |
+                int(p[py, px - 1]) << 6 | int(p[py - 1, px - 1]) << 7)
     
     def in_bounds(self, x, y):
         """Prüft ob Koordinaten im Grid liegen"""
@@ -204,22 +381,29 @@ class Grid:
     
     def is_empty(self, x, y):
         """Prüft ob Zelle leer ist"""
-        return self.in_bounds(x, y) and self.cells[y][x] == 0
+        return self.in_bounds(x, y) and self.cells[y, x] == 0
     
     def is_alive(self, x, y):
         """Prüft ob Zelle belegt ist"""
-        return self.in_bounds(x, y) and self.cells[y][x] == 1
+        return self.in_bounds(x, y) and self.cells[y, x] == 1
     
     def alive_count(self):
-        """Zählt alle belegten Zellen"""
-        return sum(sum(row) for row in self.cells)
+        """Zählt alle belegten Zellen (O(1), Zähler wird von set() gepflegt)"""
+        return self._alive
     
     def neighbors_4(self, x, y):
-        """Generator für 4-Nachbarn (N, S, E, W)"""
-        for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
-            nx, ny = x + dx, y + dy
-            if self.in_bounds(nx, ny):
-                yield nx, ny
+        """4-Nachbarn (E, W, S, N) als Tupel; innere Zellen ohne Bounds-Checks"""
+        if 0 < x < self.cols - 1 and 0 < y < self.rows - 1:
+            return self._neighbors_4_interior(x, y)
+        return self._neighbors_4_edge(x, y)
+    
+    @staticmethod
+    def _neighbors_4_interior(x, y):
+        return ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))
+    
+    def _neighbors_4_edge(self, x, y):
+        return tuple((nx, ny) for nx, ny in self._neighbors_4_interior(x, y)
+                     if self.in_bounds(nx, ny))
     
     def neighbors_8(self, x, y):
         """Generator für 8-Nachbarn (inkl. Diagonale)"""
@@ -233,21 +417,35 @@ class Grid:
     
     def count_alive_neighbors_4(self, x, y):
         """Zählt lebende 4-Nachbarn"""
-        return sum(1 for nx, ny in self.neighbors_4(x, y) if self.is_alive(nx, ny))
+        if not self.in_bounds(x, y):
+            return sum(1 for nx, ny in self.neighbors_4(x, y) if self.is_alive(nx, ny))
+        p = self._padded
+        px, py = x + 1, y + 1
+        return int(p[py, px - 1]) + int(p[py, px + 1]) + int(p[py - 1, px]) + int(p[py + 1, px])
     
     def count_alive_neighbors_8(self, x, y):
         """Zählt lebende 8-Nachbarn"""
-        return sum(1 for nx, ny in self.neighbors_8(x, y) if self.is_alive(nx, ny))
+        if not self.in_bounds(x, y):
+            return sum(1 for nx, ny in self.neighbors_8(x, y) if self.is_alive(nx, ny))
+        return int(self._padded[y:y + 3, x:x + 3].sum()) - int(self.cells[y, x])
     
     def has_alive_neighbor_4(self, x, y):
         """Prüft ob mindestens ein 4-Nachbar lebt"""
-        return any(self.is_alive(nx, ny) for nx, ny in self.neighbors_4(x, y))
-    
+        return self.count_alive_neighbors_4(x, y) > 0
+
     def get_component(self, start_x, start_y):
-        """Findet zusammenhängende Komponente via BFS"""
+        """
+        Findet zusammenhängende Komponente via BFS.
+        Ergebnisse werden pro Grid-Inhalt gecacht (frozenset).
+        """
         if not self.is_alive(start_x, start_y):
             return set()
         
+        key = (self.content_hash, start_x, start_y)
+        cached = self._component_cache.get(key)
+        if cached is not None:
+            return cached
+        
         seen = set()
         queue = deque([(start_x, start_y)])
         seen.add((start_x, start_y))
@@ -259,23 +457,105 @@ class Grid:
                     seen.add((nx, ny))
                     queue.append((nx, ny))
         
-        return seen
+        if len(self._component_cache) > 64:
+            self._component_cache.clear()
+        component = frozenset(seen)
+        self._component_cache[key] = component
+        return component
+    
+    def add_cell(self, x, y):
+        """
+        Setzt eine Zelle auf belegt und übernimmt die gecachten Komponenten
+        des bisherigen Inhalts: eine angrenzende Komponente wächst nur um die
+        neue Zelle und die Zellen, die sie anschließt; alle anderen bleiben gleich.
+        """
+        old_hash = self.content_hash
+        self.set(x, y, 1)
+        if self.content_hash == old_hash:
+            return
+        
+        carried = [(key, component) for key, component in self._component_cache.items()
+                   if key[0] == old_hash]
+        touching = [(nx, ny) for nx, ny in self.neighbors_4(x, y) if self.is_alive(nx, ny)]
+        for (_, sx, sy), component in carried:
+            if any(cell in component for cell in touching):
+                seen = set(component)
+                seen.add((x, y))
+                queue = deque([(x, y)])
+                while queue:
+                    cx, cy = queue.popleft()
+                    for nx, ny in self.neighbors_4(cx, cy):
+                        if (nx, ny) not in seen and self.is_alive(nx, ny):
+                            seen.add((nx, ny))
+                            queue.append((nx, ny))
+                component = frozenset(seen)
+            if len(self._component_cache) > 64:
+                self._component_cache.clear()
+            self._component_cache[(self.content_hash, sx, sy)] = component
+    
+    def _neighbor_bits(self):
+        """
+        Verschobene Bitboards: Bit gesetzt wenn der West-/Ost-/Nord-/Süd-
+        Nachbar lebt. Überträge zwischen den 64-Bit-Wörtern einer Zeile
+        werden mitgeschoben.
+        """
+        bits = self.bits
+        one = np.uint64(1)
+        carry = np.uint64(63)
+        
+        west = bits << one
+        west[:, 1:] |= bits[:, :-1] >> carry
+        east = bits >> one
+        east[:, :-1] |= bits[:, 1:] << carry
+        north = np.zeros_like(bits)
+        north[1:] = bits[:-1]
+        south = np.zeros_like(bits)
+        south[:-1] = bits[1:]
+        return west, east, north, south
+    
+    def _bits_to_cells(self, board):
+        """Wandelt ein Bitboard in eine zeilenweise Liste von (x, y) um"""
+        flags = np.unpackbits(board.view(np.uint8), axis=1, bitorder='little')
+        ys, xs = np.nonzero(flags[:, :self.cols])
+        return list(zip(xs.tolist(), ys.tolist()))
+    
+    def get_isolated_cells(self):
+        """Lebende Zellen ohne lebenden 4-Nachbarn (per Bit-Operationen)"""
+        west, east, north, south = self._neighbor_bits()
+        return self._bits_to_cells(self.bits & ~(west | east | north | south))
+    
+    def near_counts(self, radius):
+        """
+        Anzahl lebender Zellen im (2*radius+1)²-Fenster um jede Zelle.
+        Einmal berechnet und danach von set() im Fenster aktualisiert.
+        """
+        if self._near_counts is None or self._near_radius != radius:
+            # Separierbare Fenstersumme: erst entlang der Zeilen, dann der Spalten
+            padded = np.pad(self.cells.astype(np.int32), radius)
+            row_sums = np.zeros((self.rows + 2 * radius, self.cols), dtype=np.int32)
+            for dx in range(2 * radius + 1):
+                row_sums += padded[:, dx:dx + self.cols]
+            counts = np.zeros((self.rows, self.cols), dtype=np.int32)
+            for dy in range(2 * radius + 1):
+                counts += row_sums[dy:dy + self.rows]
+            self._near_counts = counts
+            self._near_radius = radius
+        return self._near_counts
     
     def get_all_alive_cells(self):
-        """Gibt alle lebenden Zellen zurück"""
-        cells = []
-        for y in range(self.rows):
-            for x in range(self.cols):
-                if self.cells[y][x] == 1:
-                    cells.append((x, y))
-        return cells
+        """Gibt alle lebenden Zellen zurück (zeilenweise sortiert)"""
+        ys, xs = np.nonzero(self.cells == 1)
+        return list(zip(xs.tolist(), ys.tolist()))
     
     def copy(self):
         """Erstellt eine Kopie des Grids"""
         new_grid = Grid(self.cols, self.rows)
-        for y in range(self.rows):
-            for x in range(self.cols):
-                new_grid.cells[y][x] = self.cells[y][x]
+        new_grid._padded[...] = self._padded
+        new_grid.content_hash = self.content_hash
+        new_grid._alive = self._alive
+        new_grid.bits[...] = self.bits
+        new_grid._row_bits = list(self._row_bits)
+        new_grid._col_bits = list(self._col_bits)
         return new_grid
 
 
@@ -290,28 +570,60 @@ class VerticalHolesTracker:
     Dies wird durch die Licht-Abstand-Logik natürlich erzeugt.
     """
     
-    def __init__(self):
-        self.permanent_empty = set()  # Set von (x, y) Koordinaten die immer leer bleiben
+    def __init__(self, cols=0, rows=0):
+        # Bitmap [y, x]: True = Position bleibt immer leer.
+        # Wächst bei Bedarf, da die Grid-Größe erst nach der Grenze feststeht.
+        self.mask = np.zeros((rows, cols), dtype=np.bool_)
+    
+    def _ensure_size(self, cols, rows):
+        """Vergrößert die Bitmap auf mindestens cols x rows"""
+        old_rows, old_cols = self.mask.shape
+        if cols <= old_cols and rows <= old_rows:
+            return
+        mask = np.zeros((max(rows, old_rows), max(cols, old_cols)), dtype=np.bool_)
+        mask[:old_rows, :old_cols] = self.mask
+        self.mask = mask
     
     def add_permanent_empty(self, x, y):
         """Markiert Position als permanent leer (gilt für alle Ebenen)"""
-        self.permanent_empty.add((x, y))
+        if x < 0 or y < 0:
+            return
+        self._ensure_size(x + 1, y + 1)
+        self.mask[y, x] = True
+    
+    def add_permanent_empty_mask(self, mask):
+        """Markiert alle Positionen einer (rows, cols)-Bitmap als permanent leer"""
+        rows, cols = mask.shape
+        self._ensure_size(cols, rows)
+        self.mask[:rows, :cols] |= mask
     
     def is_permanent_empty(self, x, y):
         """Prüft ob Position permanent leer sein muss"""
-        return (x, y) in self.permanent_empty
+        rows, cols = self.mask.shape
+        return 0 <= x < cols and 0 <= y < rows and bool(self.mask[y, x])
+    
+    def mask_for(self, cols, rows):
+        """Bitmap als (rows, cols)-Array passend zu einem Grid"""
+        self._ensure_size(cols, rows)
+        return self.mask[:rows, :cols]
+    
+    @property
+    def permanent_empty(self):
+        """Set von (x, y) Koordinaten (Kompatibilität, nicht für Hot Paths)"""
+        return self.get_all()
     
     def get_all(self):
         """Gibt alle permanent leeren Positionen zurück"""
-        return self.permanent_empty.copy()
+        ys, xs = np.nonzero(self.mask)
+        return set(zip(xs.tolist(), ys.tolist()))
     
     def count(self):
         """Anzahl der permanent leeren Positionen"""
-        return len(self.permanent_empty)
+        return int(np.count_nonzero(self.mask))
     
     def clear(self):
         """Löscht alle Markierungen"""
-        self.permanent_empty.clear()
+        self.mask[:] = False
     
     def sync_from_layer(self, grid, base_layer_grid=None):
         """
@@ -328,6 +640,75 @@ class VerticalHolesTracker:
                         pass  # Nicht automatisch alle leeren Positionen markieren
 
 
+# ============================================================================
+# GEOMETRIE - Kurven als Liniensegmente
+# ============================================================================
+
+def is_valid_curve(curve, closed=False, label="Kurve"):
+    """
+    Prüft eine Kurve einmal beim Hinzufügen (statt try/except pro Zelle).
+    Bei closed=True muss die Kurve geschlossen sein (für Contains).
+    """
+    if curve is None:
+        return False
+    if not getattr(curve, 'IsValid', True):
+        print("  {} ungültig - ignoriert".format(label))
+        return False
+    if closed and not curve.IsClosed:
+        print("  {} nicht geschlossen - ignoriert".format(label))
+        return False
+    return True
+
+
+def tessellate_curve(curve, step):
+    """
+    Zerlegt eine Kurve einmal in Liniensegmente (XY-Ebene).
+    Polylinien werden exakt übernommen, andere Kurven im Abstand step geteilt.
+    Die Kurve muss vorher mit is_valid_curve geprüft sein.
+    
+    Returns: Array (n, 4) mit ax, ay, bx, by oder None
+    """
+    is_polyline, polyline = curve.TryGetPolyline()
+    if is_polyline:
+        points = [(pt.X, pt.Y) for pt in polyline]
+    else:
+        params = curve.DivideByLength(step, True)
+        if params:
+            points = []
+            for t in params:
+                pt = curve.PointAt(t)
+                points.append((pt.X, pt.Y))
+            # DivideByLength endet beim letzten vollen Schritt - das Reststück
+            # bis zum Kurvenende gehört mit dazu
+            end = curve.PointAtEnd
+            if not curve.IsClosed and points[-1] != (end.X, end.Y):
+                points.append((end.X, end.Y))
+        else:
+            points = [(curve.PointAtStart.X, curve.PointAtStart.Y),
+                      (curve.PointAtEnd.X, curve.PointAtEnd.Y)]
+        if curve.IsClosed:
+            points.append(points[0])
+    
+    if len(points) < 2:
+        return None
+    pts = np.array(points, dtype=np.float64)
+    return np.hstack([pts[:-1], pts[1:]])
+
+
+def segment_distance_sq(px, py, ax, ay, bx, by):
+    """Quadrierter Abstand der Punkte (px, py) zum Segment A-B (NumPy-Arrays)"""
+    abx, aby = bx - ax, by - ay
+    length_sq = abx * abx + aby * aby
+    if length_sq > 0:
+        # Projektion auf das Segment, auf [0, 1] begrenzt
+        t = np.clip(((px - ax) * abx + (py - ay) * aby) / length_sq, 0.0, 1.0)
+    else:
+        t = 0.0
+    dx = px - (ax + t * abx)
+    dy = py - (ay + t * aby)
+    return dx * dx + dy * dy
+
+
 # ============================================================================
 # CONSTRAINTS - Grenzen, Membranen, Hindernisse
 # ============================================================================
@@ -350,10 +731,29 @@ class Constraints:
         # Vorberechnete blockierte Zellen
         self.blocked_cells = set()
         self.obstacle_cells = set()
+        
+        # Ebene für Contains einmal holen (WorldXY erzeugt jedes Mal eine neue Plane)
+        self._world_xy = rg.Plane.WorldXY
+        
+        # Erlaubt-Maske (rows, cols), wird von finalize() berechnet
+        self.allowed_mask = None
+        self._outer_line_mask = None
+        # Hindernis-Maske (rows+2, cols+2) mit Rand, ebenfalls aus finalize()
+        self.obstacle_mask = None
+        
+        # Zellenmitten in Weltkoordinaten (1D: cx[x], cy[y])
+        self.cx = None
+        self.cy = None
+        self._centers_key = None
     
     def set_boundary(self, curve):
         """Setzt die Grundstücksgrenze und berechnet Grid-Größe"""
-        self.boundary_curve = curve
+        # Nur gültige, geschlossene Grenzen werden für Contains verwendet;
+        # sonst gilt jede Zelle als innerhalb (wie bisher im except-Fall)
+        self.boundary_curve = curve if is_valid_curve(curve, True, "Grenze") else None
+        self.allowed_mask = None
+        self.obstacle_mask = None
+        self._outer_line_mask = None
         if curve:
             bbox = rs.BoundingBox([curve])
             if bbox:
@@ -365,49 +765,93 @@ class Constraints:
                 
                 self.cols = int(math.ceil(width / self.config.CELL_SIZE)) + 1
                 self.rows = int(math.ceil(height / self.config.CELL_SIZE)) + 1
+                self._build_cell_centers()
+    
+    def _build_cell_centers(self):
+        """Berechnet die Zellenmitten einmal für alle Spalten und Zeilen"""
+        ox, oy, _ = self.origin
+        cell = self.config.CELL_SIZE
+        self.cx = ox + np.arange(self.cols) * cell + cell * 0.5
+        self.cy = oy + np.arange(self.rows) * cell + cell * 0.5
+        self._centers_key = (self.origin, self.cols, self.rows, cell)
+    
+    def _cell_centers(self):
+        """Gibt (cx, cy) zurück und baut sie neu, falls sich das Grid geändert hat"""
+        if self._centers_key != (self.origin, self.cols, self.rows, self.config.CELL_SIZE):
+            self._build_cell_centers()
+        return self.cx, self.cy
     
     def add_membrane(self, curve):
         """Fügt eine Membran hinzu"""
-        if curve:
+        if is_valid_curve(curve, True, "Membran"):
             self.membranes.append(curve)
+            self.allowed_mask = None
     
     def add_outer_line(self, curve):
         """Fügt eine äußere Linie hinzu"""
-        if curve:
+        if is_valid_curve(curve, False, "Äußere Linie"):
             self.outer_lines.append(curve)
+            self.allowed_mask = None
+            self._outer_line_mask = None
     
     def add_obstacle(self, curve):
         """Fügt ein Hindernis hinzu und berechnet blockierte Zellen"""
-        if curve:
+        if is_valid_curve(curve, False, "Hindernis"):
             self.obstacles.append(curve)
             self._compute_obstacle_cells(curve)
+            self.allowed_mask = None
+            self.obstacle_mask = None
     
     def _compute_obstacle_cells(self, curve):
         """Berechnet welche Zellen durch ein Hindernis blockiert sind"""
-        clearance = self.config.OBSTACLE_CLEARANCE
+        clearance = self.config.OBSTACLE_CLEARANCE * self.config.CELL_SIZE
+        segments = tessellate_curve(curve, self.config.CELL_SIZE * 0.5)
+        if segments is None:
+            return
         
-        for y in range(self.rows):
-            for x in range(self.cols):
-                center = self.cell_center_world(x, y)
-                pt = rg.Point3d(center[0], center[1], center[2])
-                
-                # Prüfe Abstand zur Kurve
-                try:
-                    closest = curve.ClosestPoint(pt, 0.0)
-                    if closest[0]:
-                        dist = pt.DistanceTo(curve.PointAt(closest[1]))
-                        if dist <= clearance * self.config.CELL_SIZE:
-                            self.obstacle_cells.add((x, y))
-                            self.blocked_cells.add((x, y))
-                except:
-                    pass
+        mask = self._cells_near_segments(segments, clearance)
+        for y, x in np.argwhere(mask).tolist():
+            self.obstacle_cells.add((x, y))
+            self.blocked_cells.add((x, y))
+    
+    def _cells_near_segments(self, segments, max_dist):
+        """
+        Markiert alle Zellen deren Mittelpunkt höchstens max_dist von einem
+        Segment entfernt ist. Jedes Segment prüft nur die Zellen innerhalb
+        seiner um max_dist erweiterten Bounding Box (das Grid dient als
+        gleichmäßiger Raumindex).
+        """
+        mask = np.zeros((self.rows, self.cols), dtype=np.bool_)
+        cell = self.config.CELL_SIZE
+        ox, oy, _ = self.origin
+        cx, cy = self._cell_centers()
+        max_dist_sq = max_dist * max_dist
+        
+        for ax, ay, bx, by in segments.tolist():
+            x0 = max(int(math.floor((min(ax, bx) - max_dist - ox) / cell - 0.5)), 0)
+            x1 = min(int(math.ceil((max(ax, bx) + max_dist - ox) / cell - 0.5)), self.cols - 1)
+            y0 = max(int(math.floor((min(ay, by) - max_dist - oy) / cell - 0.5)), 0)
+            y1 = min(int(math.ceil((max(ay, by) + max_dist - oy) / cell - 0.5)), self.rows - 1)
+            if x0 > x1 or y0 > y1:
+                continue
+            
+            px = cx[np.newaxis, x0:x1 + 1]
+            py = cy[y0:y1 + 1, np.newaxis]
+            
+            dist_sq = segment_distance_sq(px, py, ax, ay, bx, by)
+            mask[y0:y1 + 1, x0:x1 + 1] |= dist_sq <= max_dist_sq
+        
+        return mask
     
     def cell_center_world(self, x, y, layer=0):
         """Berechnet Weltkoordinaten der Zellenmitte"""
         ox, oy, oz = self.origin
+        wz = oz + layer * self.config.CELL_SIZE
+        cx, cy = self._cell_centers()
+        if 0 <= x < self.cols and 0 <= y < self.rows:
+            return (float(cx[x]), float(cy[y]), wz)
         wx = ox + x * self.config.CELL_SIZE + self.config.CELL_SIZE * 0.5
         wy = oy + y * self.config.CELL_SIZE + self.config.CELL_SIZE * 0.5
-        wz = oz + layer * self.config.CELL_SIZE
         return (wx, wy, wz)
     
     def world_to_cell(self, wx, wy):
@@ -417,54 +861,73 @@ class Constraints:
         y = int(math.floor((wy - oy) / self.config.CELL_SIZE))
         return x, y
     
-    def is_in_boundary(self, x, y):
+    def _cell_point(self, x, y):
+        """Zellenmitte als Point3d (z = 0) für Contains-Abfragen"""
+        center = self.cell_center_world(x, y)
+        return rg.Point3d(center[0], center[1], 0)
+    
+    def is_in_boundary(self, x, y, pt=None):
         """Prüft ob Zelle innerhalb der Grundstücksgrenze liegt"""
         if not self.boundary_curve:
             return True
         
-        center = self.cell_center_world(x, y)
-        pt = rg.Point3d(center[0], center[1], 0)
+        if pt is None:
+            pt = self._cell_point(x, y)
         
-        try:
-            result = self.boundary_curve.Contains(pt, rg.Plane.WorldXY, 0.001)
-            return result == rg.PointContainment.Inside
-        except:
-            return True
+        result = self.boundary_curve.Contains(pt, self._world_xy, 0.001)
+        return result == rg.PointContainment.Inside
     
-    def is_in_membrane(self, x, y):
+    def is_in_membrane(self, x, y, pt=None):
         """Prüft ob Zelle innerhalb einer Membran liegt"""
-        center = self.cell_center_world(x, y)
-        pt = rg.Point3d(center[0], center[1], 0)
+        if not self.membranes:
+            return False
+        
+        if pt is None:
+            pt = self._cell_point(x, y)
         
         for membrane in self.membranes:
-            try:
-                if hasattr(membrane, 'Contains'):
-                    result = membrane.Contains(pt, rg.Plane.WorldXY, 0.001)
-                    if result == rg.PointContainment.Inside:
-                        return True
-            except:
-                pass
+            result = membrane.Contains(pt, self._world_xy, 0.001)
+            if result == rg.PointContainment.Inside:
+                return True
         return False
     
     def is_blocked_by_outer_line(self, x, y):
         """Prüft ob Zelle zu nah an einer äußeren Linie ist"""
         if not self.outer_lines:
             return False
+        if not (0 <= x < self.cols and 0 <= y < self.rows):
+            return False
         
-        center = self.cell_center_world(x, y)
-        pt = rg.Point3d(center[0], center[1], 0)
-        clearance = self.config.MEMBRANE_CLEARANCE * self.config.CELL_SIZE
+        if self._outer_line_mask is None:
+            clearance = self.config.MEMBRANE_CLEARANCE * self.config.CELL_SIZE
+            mask = np.zeros((self.rows, self.cols), dtype=np.bool_)
+            for line in self.outer_lines:
+                segments = tessellate_curve(line, self.config.CELL_SIZE * 0.5)
+                if segments is not None:
+                    mask |= self._cells_near_segments(segments, clearance)
+            self._outer_line_mask = mask
         
-        for line in self.outer_lines:
-            try:
-                closest = line.ClosestPoint(pt, 0.0)
-                if closest[0]:
-                    dist = pt.DistanceTo(line.PointAt(closest[1]))
-                    if dist <= clearance:
-                        return True
-            except:
-                pass
-        return False
+        return bool(self._outer_line_mask[y, x])
+    
+    def finalize(self):
+        """
+        Berechnet die Erlaubt-Maske einmal für das ganze Grid.
+        Aufrufen nachdem alle Membranen, Linien und Hindernisse gesetzt sind;
+        danach ist is_allowed ein einzelner Array-Zugriff.
+        """
+        mask = np.zeros((self.rows, self.cols), dtype=np.bool_)
+        for y in range(self.rows):
+            for x in range(self.cols):
+                mask[y, x] = self._check_allowed(x, y)
+        self.allowed_mask = mask
+        
+        # Hindernisse als Array mit einer Zelle Rand (Index = Koordinate + 1)
+        obstacle_mask = np.zeros((self.rows + 2, self.cols + 2), dtype=np.uint8)
+        for x, y in self.obstacle_cells:
+            if -1 <= x <= self.cols and -1 <= y <= self.rows:
+                obstacle_mask[y + 1, x + 1] = 1
+        self.obstacle_mask = obstacle_mask
+        return mask
     
     def is_allowed(self, x, y):
         """Zentrale Prüfung ob eine Zelle erlaubt ist"""
@@ -472,16 +935,27 @@ class Constraints:
         if not (0 <= x < self.cols and 0 <= y < self.rows):
             return False
         
+        if self.allowed_mask is not None:
+            return bool(self.allowed_mask[y, x])
+        return self._check_allowed(x, y)
+    
+    def _check_allowed(self, x, y):
+        """Prüft eine Zelle direkt gegen alle Kurven (ohne Maske)"""
         # Blockierte Zellen
         if (x, y) in self.blocked_cells:
             return False
         
+        # Eine Zellenmitte für Grenze und Membranen
+        pt = None
+        if self.boundary_curve or self.membranes:
+            pt = self._cell_point(x, y)
+        
         # Boundary-Check
-        if not self.is_in_boundary(x, y):
+        if not self.is_in_boundary(x, y, pt):
             return False
         
         # Membran-Check
-        if self.is_in_membrane(x, y):
+        if self.is_in_membrane(x, y, pt):
             return False
         
         # Äußere Linien
@@ -504,6 +978,11 @@ class GrowthPoint:
         self.radius = radius      # Wirkungsradius in Zellen
         self.is_line = is_line
         self.curve = curve        # Rhino-Kurve bei Linien
+        self._segments = None     # Tessellierte Linie (n, 4), lazy
+        self._segments_step = None
+        self._reach = None        # radius * cell_size, für _point_influence
+        self._reach_sq = None
+        self._reach_cell_size = None
     
     def get_influence(self, x, y, cell_size, origin):
         """Berechnet Einfluss auf eine Zelle"""
@@ -521,135 +1000,460 @@ class GrowthPoint:
         wx = ox + x * cell_size + cell_size * 0.5
         wy = oy + y * cell_size + cell_size * 0.5
         
+        # Reichweite (und Quadrat) nur bei neuer Zellengröße berechnen
+        if self._reach_cell_size != cell_size:
+            self._reach = self.radius * cell_size
+            self._reach_sq = self._reach * self._reach
+            self._reach_cell_size = cell_size
+        
         dx = wx - self.position[0]
         dy = wy - self.position[1]
-        dist = math.sqrt(dx * dx + dy * dy)
+        dist_sq = dx * dx + dy * dy
         
-        if dist > self.radius * cell_size:
+        # Außerhalb der Reichweite: ohne Wurzel zurück
+        if dist_sq > self._reach_sq:
             return 0.0
         
         # Linearer Abfall mit Distanz
-        factor = 1.0 - (dist / (self.radius * cell_size))
+        factor = 1.0 - (math.sqrt(dist_sq) / self._reach)
         return self.strength * factor
     
     def _line_influence(self, x, y, cell_size, origin):
         """Einfluss einer Linien-Attraktor"""
         if not self.curve:
             return 0.0
+        return float(self.line_influences(np.array([x]), np.array([y]), cell_size, origin)[0])
+    
+    def line_influences(self, xs, ys, cell_size, origin):
+        """
+        Einfluss der Linie auf viele Zellen auf einmal.
+        Die Kurve wird einmal tesselliert; der Abstand ist das Minimum
+        über alle Segmente (XY-Ebene), ohne Rhino-Aufrufe pro Zelle.
+        """
+        step = cell_size * 0.5
+        if self._segments_step != step:
+            self._segments = tessellate_curve(self.curve, step)
+            self._segments_step = step
+        if self._segments is None:
+            return np.zeros(len(xs))
         
         ox, oy, _ = origin
-        wx = ox + x * cell_size + cell_size * 0.5
-        wy = oy + y * cell_size + cell_size * 0.5
-        pt = rg.Point3d(wx, wy, 0)
+        wx = ox + xs * cell_size + cell_size * 0.5
+        wy = oy + ys * cell_size + cell_size * 0.5
+        reach = self.radius * cell_size
         
-        try:
-            closest = self.curve.ClosestPoint(pt, 0.0)
-            if closest[0]:
-                dist = pt.DistanceTo(self.curve.PointAt(closest[1]))
-                if dist > self.radius * cell_size:
-                    return 0.0
-                factor = 1.0 - (dist / (self.radius * cell_size))
-                return self.strength * factor
-        except:
-            pass
+        dist_sq = np.full(len(xs), np.inf)
+        for ax, ay, bx, by in self._segments.tolist():
+            np.minimum(dist_sq, segment_distance_sq(wx, wy, ax, ay, bx, by), out=dist_sq)
         
-        return 0.0
+        factor = np.maximum(0.0, 1.0 - np.sqrt(dist_sq) / reach)
+        return self.strength * factor
 
 
 # ============================================================================
-# SMOOTHNESS CALCULATOR - Für glattere Formen
+# FLOOD-FILL - Außenbereich als Bitmap
 # ============================================================================
 
-class SmoothnessCalculator:
-    """Berechnet wie glatt/organisch eine Form ist"""
+def _fill_runs(seed, empty):
+    """
+    Erweitert seed auf alle zusammenhängenden leeren Abschnitte jeder Zeile,
+    die eine seed-Zelle enthalten (Abschnitte per cumsum nummeriert).
+    """
+    starts = empty.copy()
+    starts[:, 1:] &= ~empty[:, :-1]
+    run_ids = np.cumsum(starts.ravel()).reshape(empty.shape)
+    hit = np.zeros(int(run_ids[-1, -1]) + 1, dtype=np.bool_)
+    hit[run_ids[seed & empty]] = True
+    return hit[run_ids] & empty
+
+
+def flood_fill_outside(empty):
+    """
+    Alle leeren Zellen die vom Grid-Rand aus (4er-Nachbarschaft) erreichbar sind.
+    Abwechselnd zeilen- und spaltenweise Füllen ganzer leerer Abschnitte,
+    bis sich nichts mehr ändert - die Anzahl Durchläufe hängt von den
+    Richtungswechseln der Wege ab, nicht von ihrer Länge.
     
-    @staticmethod
-    def edge_count(grid, x, y):
-        """
-        Zählt wie viele Kanten die Zelle zur Außenwelt hätte.
-        Weniger Kanten = glatter
-        """
-        edges = 0
-        for nx, ny in grid.neighbors_4(x, y):
-            if not grid.is_alive(nx, ny):
-                edges += 1
-        # Auch Rand zählt als Kante
-        if x == 0 or x == grid.cols - 1:
-            edges += 1
-        if y == 0 or y == grid.rows - 1:
-            edges += 1
-        return edges
+    Args:
+        empty: bool-Array (rows, cols), True = leere Zelle
     
-    @staticmethod
-    def smoothness_score(grid, x, y):
-        """
-        Berechnet Glattheits-Score für eine potenzielle Zelle.
-        Höher = besser (glatter)
-        
-        Bevorzugt:
-        - Zellen die konkave Bereiche füllen
-        - Zellen mit vielen Nachbarn
-        - Zellen die keine "Halbinseln" erzeugen
-        """
-        score = 0.0
-        
-        # Mehr Nachbarn = besser (füllt Lücken)
-        neighbors_4 = grid.count_alive_neighbors_4(x, y)
-        neighbors_8 = grid.count_alive_neighbors_8(x, y)
-        
-        # Bonus für 4-Nachbarn (direkte Verbindung)
-        score += neighbors_4 * 2.0
-        
-        # Bonus für 8-Nachbarn (diagonale = füllt Ecken)
-        diagonal_neighbors = neighbors_8 - neighbors_4
-        score += diagonal_neighbors * 1.5
-        
-        # Penalty für zu wenige Nachbarn (würde Halbinsel erzeugen)
-        if neighbors_4 == 1:
-            score -= 2.0  # Nur ein Nachbar = potenzielle Halbinsel
-        
-        # Bonus wenn Zelle eine "Ecke" füllt (2 orthogonale Nachbarn)
-        if neighbors_4 == 2:
-            # Prüfe ob die Nachbarn orthogonal sind (Ecke)
-            alive_neighbors = [(nx, ny) for nx, ny in grid.neighbors_4(x, y) if grid.is_alive(nx, ny)]
-            if len(alive_neighbors) == 2:
-                n1, n2 = alive_neighbors
-                if n1[0] != n2[0] and n1[1] != n2[1]:  # Orthogonal
-                    score += 3.0  # Ecke füllen ist gut
-        
-        # Bonus wenn Zelle von 3 Seiten umgeben ist (füllt Bucht)
-        if neighbors_4 >= 3:
-            score += 4.0
+    Returns: bool-Array (rows, cols), True = Außenzelle
+    """
+    outside = np.zeros_like(empty)
+    if empty.size == 0:
+        return outside
+    outside[0, :] = empty[0, :]
+    outside[-1, :] = empty[-1, :]
+    outside[:, 0] |= empty[:, 0]
+    outside[:, -1] |= empty[:, -1]
+    
+    count = -1
+    empty_t = empty.T
+    while True:
+        outside = _fill_runs(outside, empty)
+        outside = _fill_runs(outside.T, empty_t).T
+        new_count = int(np.count_nonzero(outside))
+        if new_count == count:
+            return outside
+        count = new_count
+
+
+def ring_connected_table():
+    """
+    Tabelle über alle 256 Belegungen des 8er-Rings um eine Zelle
+    (Bit k gesetzt = Ringzelle k belegt, Reihenfolge N, NO, O, SO, S, SW, W, NW).
+    True, wenn alle leeren 4-Nachbarn (Bits 0, 2, 4, 6) in einem zusammen-
+    hängenden leeren Ringabschnitt liegen: dann bleiben sie auch mit belegter
+    Mitte über den Ring verbunden.
+    """
+    table = []
+    for mask in range(256):
+        empty = [not (mask >> k) & 1 for k in range(8)]
+        if all(empty):
+            table.append(True)
+            continue
+        # Abschnitte leerer Ringzellen zyklisch nummerieren, Start nach einer belegten
+        start = empty.index(False)
+        run_of = [None] * 8
+        run = 0
+        for step in range(1, 9):
+            k = (start + step) % 8
+            if empty[k]:
+                run_of[k] = run
+            else:
+                run += 1
+        runs = set(run_of[k] for k in (0, 2, 4, 6) if empty[k])
+        table.append(len(runs) <= 1)
+    return table
+
+
+# ============================================================================
+# NUMBA-KERNEL - Scoring aller Kandidaten in einem Aufruf
+# ============================================================================
+
+@njit(cache=True, parallel=True)
+def score_frontier(padded, xs, ys, growth_field, support_field, light_field,
+                   obstacle_field, edge_bonus, weights):
+    """Berechnet den Score aller Kandidaten eines Wachstumsschritts
+    
+    Nachbarn, Glattheit, Konvexität und Breite werden direkt aus dem
+    gepolsterten uint8-Grid gelesen; Growth Points, Layer-Unterstützung,
+    Licht und Hindernisse kommen als vorberechnete Felder, der Rand-Bonus
+    (BFS) als Wert pro Kandidat.
+    
+    Args:
+        weights: (connected, smoothness, convexity, light, obstacle,
+                  min_width, preferred_width, width_bonus, balance_weight)
+    
+    Returns:
+        Float-Array mit einem Score pro Kandidat (-inf = blockiert)
+    """
+    (w_connected, w_smoothness, w_convexity, w_light, w_obstacle,
+     min_width, preferred_width, width_bonus, balance_weight) = weights
+    count = xs.shape[0]
+    scores = np.empty(count, dtype=np.float64)
+    
+    for i in prange(count):
+        x = xs[i]
+        y = ys[i]
+        px = x + 1
+        py = y + 1
+        
+        n = int(padded[py - 1, px])
+        s = int(padded[py + 1, px])
+        w = int(padded[py, px - 1])
+        e = int(padded[py, px + 1])
+        nw = int(padded[py - 1, px - 1])
+        ne = int(padded[py - 1, px + 1])
+        sw = int(padded[py + 1, px - 1])
+        se = int(padded[py + 1, px + 1])
+        n4 = n + s + w + e
+        diagonal = nw + ne + sw + se
+        
+        # Glattheit: Lücken, Ecken und Buchten füllen, keine Halbinseln
+        smooth = n4 * 2.0 + diagonal * 1.5
+        if n4 == 1:
+            smooth -= 2.0
+        elif n4 == 2:
+            if w * e + n * s == 0:
+                smooth += 3.0
+        elif n4 >= 3:
+            smooth += 4.0
+        
+        # Konvexität: belegte Diagonalen und gefüllte konkave Ecken
+        concave = (w * n * (1 - nw) + w * s * (1 - sw) +
+                   e * n * (1 - ne) + e * s * (1 - se))
+        convex = diagonal * 0.5 + concave * 2.0
+        
+        # Breite (symmetrisch in beiden Richtungen) - der Null-Rand beendet die Läufe
+        count_h = 1
+        k = px - 1
+        while padded[py, k] == 1:
+            count_h += 1
+            k -= 1
+        k = px + 1
+        while padded[py, k] == 1:
+            count_h += 1
+            k += 1
+        count_v = 1
+        k = py - 1
+        while padded[k, px] == 1:
+            count_v += 1
+            k -= 1
+        k = py + 1
+        while padded[k, px] == 1:
+            count_v += 1
+            k += 1
         
-        return score
+        if count_h < min_width:
+            score_h = -width_bonus * (min_width - count_h) * 0.5
+        elif count_h <= preferred_width:
+            score_h = width_bonus * (count_h - min_width) * 0.5
+        else:
+            score_h = width_bonus * (preferred_width - min_width) * 0.5
+        if count_v < min_width:
+            score_v = -width_bonus * (min_width - count_v) * 0.5
+        elif count_v <= preferred_width:
+            score_v = width_bonus * (count_v - min_width) * 0.5
+        else:
+            score_v = width_bonus * (preferred_width - min_width) * 0.5
+        balance_bonus = 0.0
+        if count_h >= 2 and count_v >= 2:
+            ratio = min(count_h, count_v) / max(count_h, count_v)
+            balance_bonus = width_bonus * ratio * balance_weight
+        
+        score = growth_field[y, x]
+        score += n4 * w_connected
+        score += smooth * w_smoothness
+        score += convex * w_convexity
+        score += support_field[y, x]
+        score += light_field[y, x] * w_light
+        score += obstacle_field[y, x] * w_obstacle
+        score += edge_bonus[i]
+        score += score_h + score_v + balance_bonus
+        scores[i] = score
+    
+    return scores
+
+
+def _alive_runs(alive):
+    """
+    Für jede Zelle die Anzahl zusammenhängend belegter Zellen, die bei ihr
+    enden, von links bzw. von rechts gezählt (0 für leere Zellen).
+    """
+    idx = np.arange(1, alive.shape[1] + 1)
+    left = idx - np.maximum.accumulate(np.where(alive, 0, idx), axis=1)
+    right = idx - np.maximum.accumulate(np.where(alive[:, ::-1], 0, idx), axis=1)
+    return left, right[:, ::-1]
+
+
+def score_frontier_vectorized(padded, xs, ys, growth_field, support_field, light_field,
+                              obstacle_field, edge_bonus, weights):
+    """
+    NumPy-Variante von score_frontier für Rhino ohne Numba: jeder Summand
+    wird für alle Kandidaten auf einmal berechnet und in derselben
+    Reihenfolge addiert. Gleiche Argumente, gleiches Ergebnis.
+    """
+    (w_connected, w_smoothness, w_convexity, w_light, w_obstacle,
+     min_width, preferred_width, width_bonus, balance_weight) = weights
+    grid = padded.astype(np.int64)
+    px = xs + 1
+    py = ys + 1
+    
+    n = grid[py - 1, px]
+    s = grid[py + 1, px]
+    w = grid[py, px - 1]
+    e = grid[py, px + 1]
+    nw = grid[py - 1, px - 1]
+    ne = grid[py - 1, px + 1]
+    sw = grid[py + 1, px - 1]
+    se = grid[py + 1, px + 1]
+    n4 = n + s + w + e
+    diagonal = nw + ne + sw + se
+    
+    # Glattheit
+    smooth = n4 * 2.0 + diagonal * 1.5
+    smooth = np.where(n4 == 1, smooth - 2.0, smooth)
+    smooth = np.where((n4 == 2) & (w * e + n * s == 0), smooth + 3.0, smooth)
+    smooth = np.where(n4 >= 3, smooth + 4.0, smooth)
+    
+    # Konvexität
+    concave = (w * n * (1 - nw) + w * s * (1 - sw) +
+               e * n * (1 - ne) + e * s * (1 - se))
+    convex = diagonal * 0.5 + concave * 2.0
+    
+    # Breite aus den Lauflängen der belegten Zellen (Null-Rand beendet sie)
+    alive = padded == 1
+    run_left, run_right = _alive_runs(alive)
+    run_up, run_down = (run.T for run in _alive_runs(alive.T))
+    count_h = 1 + run_left[py, px - 1] + run_right[py, px + 1]
+    count_v = 1 + run_up[py - 1, px] + run_down[py + 1, px]
+    
+    full_h = width_bonus * (preferred_width - min_width) * 0.5
+    score_h = np.where(count_h < min_width, -width_bonus * (min_width - count_h) * 0.5,
+                       np.where(count_h <= preferred_width,
+                                width_bonus * (count_h - min_width) * 0.5, full_h))
+    score_v = np.where(count_v < min_width, -width_bonus * (min_width - count_v) * 0.5,
+                       np.where(count_v <= preferred_width,
+                                width_bonus * (count_v - min_width) * 0.5, full_h))
+    ratio = np.minimum(count_h, count_v) / np.maximum(count_h, count_v)
+    balance_bonus = np.where((count_h >= 2) & (count_v >= 2),
+                             width_bonus * ratio * balance_weight, 0.0)
+    
+    score = growth_field[ys, xs]
+    score = score + n4 * w_connected
+    score = score + smooth * w_smoothness
+    score = score + convex * w_convexity
+    score = score + support_field[ys, xs]
+    score = score + light_field[ys, xs] * w_light
+    score = score + obstacle_field[ys, xs] * w_obstacle
+    score = score + edge_bonus
+    score = score + (score_h + score_v + balance_bonus)
+    return score
+
+
+@njit(cache=True)
+def bfs_outside(cells, outside, queue):
+    """
+    Flood-Fill vom Grid-Rand durch leere Zellen (cells == 0) in outside.
+    queue ist ein Puffer mit mindestens rows * cols Einträgen.
+    """
+    rows, cols = cells.shape
+    tail = 0
+    for y in range(rows):
+        for x in range(cols):
+            if (x == 0 or x == cols - 1 or y == 0 or y == rows - 1) and cells[y, x] == 0:
+                outside[y, x] = True
+                queue[tail] = y * cols + x
+                tail += 1
+    
+    head = 0
+    while head < tail:
+        idx = queue[head]
+        head += 1
+        cx = idx % cols
+        cy = idx // cols
+        for k in range(4):
+            nx = cx + (1 if k == 0 else -1 if k == 1 else 0)
+            ny = cy + (1 if k == 2 else -1 if k == 3 else 0)
+            if nx < 0 or nx >= cols or ny < 0 or ny >= rows:
+                continue
+            if cells[ny, nx] == 0 and not outside[ny, nx]:
+                outside[ny, nx] = True
+                queue[tail] = ny * cols + nx
+                tail += 1
+
+
+@njit(cache=True)
+def bfs_distance_field(outside, dist, queue):
+    """
+    Mehrquellen-BFS von allen Außenzellen: dist[y, x] = Schritte zur nächsten
+    Außenzelle, 9999 ohne Außenbereich. Der Abstand selbst dient als visited.
+    """
+    rows, cols = outside.shape
+    tail = 0
+    for y in range(rows):
+        for x in range(cols):
+            if outside[y, x]:
+                dist[y, x] = 0
+                queue[tail] = y * cols + x
+                tail += 1
+            else:
+                dist[y, x] = 9999
+    
+    head = 0
+    while head < tail:
+        idx = queue[head]
+        head += 1
+        cx = idx % cols
+        cy = idx // cols
+        step = dist[cy, cx] + 1
+        for k in range(4):
+            nx = cx + (1 if k == 0 else -1 if k == 1 else 0)
+            ny = cy + (1 if k == 2 else -1 if k == 3 else 0)
+            if nx < 0 or nx >= cols or ny < 0 or ny >= rows:
+                continue
+            if dist[ny, nx] > step:
+                dist[ny, nx] = step
+                queue[tail] = ny * cols + nx
+                tail += 1
+
+
+@njit(cache=True)
+def bfs_nearest(field, value, x, y, visited, queue, depth, stamp):
+    """
+    BFS über das ganze Grid ab (x, y): Schritte bis zur nächsten Zelle mit
+    field == value (die Startzelle zählt nicht), 9999 wenn keine erreichbar.
+    visited gilt als gesetzt wenn es gleich stamp ist (kein Löschen pro Aufruf).
+    """
+    rows, cols = field.shape
+    visited[y * cols + x] = stamp
+    queue[0] = y * cols + x
+    depth[0] = 0
+    head = 0
+    tail = 1
+    while head < tail:
+        idx = queue[head]
+        dist = depth[head]
+        head += 1
+        cx = idx % cols
+        cy = idx // cols
+        for k in range(4):
+            nx = cx + (1 if k == 0 else -1 if k == 1 else 0)
+            ny = cy + (1 if k == 2 else -1 if k == 3 else 0)
+            if nx < 0 or nx >= cols or ny < 0 or ny >= rows:
+                continue
+            n = ny * cols + nx
+            if visited[n] == stamp:
+                continue
+            if field[ny, nx] == value:
+                return dist + 1
+            visited[n] = stamp
+            queue[tail] = n
+            depth[tail] = dist + 1
+            tail += 1
+    return 9999
+
+
+@njit(cache=True)
+def bfs_can_reach_edge(cells, sx, sy, max_depth, vx, vy, visited, queue, depth, stamp):
+    """
+    Wie GrowthEngine._can_reach_edge: begrenzte BFS durch leere Zellen zum Rand.
+    (vx, vy) gilt als belegt (-1, -1 für keine virtuelle Zelle).
+    """
+    rows, cols = cells.shape
+    if sx == 0 or sx == cols - 1 or sy == 0 or sy == rows - 1:
+        return True
     
-    @staticmethod
-    def convexity_score(grid, x, y):
-        """
-        Berechnet wie sehr die Zelle zur Konvexität beiträgt. 
-        Höher = konvexer (besser)
-        """
-        # Zähle wie viele diagonale Ecken gefüllt wären
-        corners_filled = 0
-        corner_offsets = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
-        
-        for dx, dy in corner_offsets:
-            nx, ny = x + dx, y + dy
-            if grid.is_alive(nx, ny):
-                corners_filled += 1
-        
-        # Prüfe ob die Zelle eine "Einbuchtung" füllt
-        # (beide orthogonalen Nachbarn einer Ecke sind belegt)
-        filling_concave = 0
-        for dx, dy in corner_offsets:
-            nx1, ny1 = x + dx, y
-            nx2, ny2 = x, y + dy
-            if grid.is_alive(nx1, ny1) and grid.is_alive(nx2, ny2):
-                # Diese Ecke wäre konkav ohne unsere Zelle
-                if not grid.is_alive(x + dx, y + dy):
-                    filling_concave += 1
-        
-        return corners_filled * 0.5 + filling_concave * 2.0
+    visited[sy * cols + sx] = stamp
+    queue[0] = sy * cols + sx
+    depth[0] = 0
+    head = 0
+    tail = 1
+    while head < tail:
+        idx = queue[head]
+        dist = depth[head]
+        head += 1
+        if dist >= max_depth:
+            return True
+        cx = idx % cols
+        cy = idx // cols
+        for k in range(4):
+            nx = cx + (1 if k == 0 else -1 if k == 1 else 0)
+            ny = cy + (1 if k == 2 else -1 if k == 3 else 0)
+            if nx < 0 or nx >= cols or ny < 0 or ny >= rows:
+                continue
+            if cells[ny, nx] != 0 or (nx == vx and ny == vy):
+                continue
+            if nx == 0 or nx == cols - 1 or ny == 0 or ny == rows - 1:
+                return True
+            n = ny * cols + nx
+            if visited[n] != stamp:
+                visited[n] = stamp
+                queue[tail] = n
+                depth[tail] = dist + 1
+                tail += 1
+    return False
 
 
 # ============================================================================
@@ -659,28 +1463,86 @@ class SmoothnessCalculator:
 class GrowthEngine:
     """Steuert das Zellwachstum mit Licht-Abstand-Logik"""
     
+    # Ringbelegungen, bei denen eine belegte Mitte keine leeren Nachbarn trennt
+    _RING_CONNECTED = ring_connected_table()
+    
     def __init__(self, config, constraints, vertical_holes_tracker):
         self.config = config
         self.constraints = constraints
         self.vertical_holes_tracker = vertical_holes_tracker
         self.growth_points = []
         self.start_cells = []
+        self.start_cells_set = frozenset()  # für Zugehörigkeitstests
         self.start_groups = []  # NEU: Liste von Startgruppen
         self.current_group_start = []  # NEU: Aktuell wachsende Gruppe (für Scoring)
-        self.smoothness = SmoothnessCalculator()
         self.current_function = "Living"  # Wird pro Layer gesetzt
         self.current_preset = {}  # NEU: Aktuelles Preset für diese Wachstumsphase
-        # NEU: Cache für Außenzellen-Berechnung
-        self._outside_cache = None
-        self._outside_cache_hash = None
+        self.runtime = RuntimeConfig(config, self.current_preset, self.current_function)
+        # NEU: Cache für Außenzellen-Berechnung: (cols, rows, content_hash) -> Maske.
+        # Mehrere Einträge, damit der Zustand vor einer Probe-Platzierung erhalten bleibt
+        self._outside_cache = {}
+        # Puffer für die BFS-Kernel (visited per Stempel, Queue, Tiefe)
+        self._bfs_visited = None
+        self._bfs_queue = None
+        self._bfs_depth = None
+        self._bfs_stamp = 0
+        # Besucht-Marken der Python-BFS ohne Numba (Liste, gleicher Stempel-Trick)
+        self._visit_marks = []
+        self._visit_stamp = 0
+        # Abstandsfeld zum Außenbereich und Außen-Maske (für den Rand-Bonus)
+        self._edge_field = None
+        self._outside_mask = None
+        self._edge_field_key = None
+        # Score-Felder für score_frontier: Growth Points (lazy, NaN = offen)
+        # und pro Layer (Unterstützung, Licht, Hindernisse)
+        self._growth_field = None
+        self._layer_fields = None
+        self._layer_fields_key = None
+        # Punkt-Attraktoren als Arrays (SoA) für point_influences
+        self._gp_arrays = None
     
     def add_growth_point(self, gp):
         """Fügt einen Growth Point hinzu"""
+        if gp.is_line and not is_valid_curve(gp.curve, False, "Growth-Linie"):
+            return
         self.growth_points.append(gp)
+        self._growth_field = None
+        self._gp_arrays = None
+    
+    def _build_growth_point_arrays(self):
+        """Sammelt alle Punkt-Attraktoren in Arrays (px, py, strength, radius)"""
+        points = [gp for gp in self.growth_points
+                  if not (gp.is_line and gp.curve) and gp.position]
+        self._gp_arrays = (
+            np.array([gp.position[0] for gp in points], dtype=np.float64),
+            np.array([gp.position[1] for gp in points], dtype=np.float64),
+            np.array([gp.strength for gp in points], dtype=np.float64),
+            np.array([gp.radius for gp in points], dtype=np.float64),
+        )
+        return self._gp_arrays
+    
+    def point_influences(self, xs, ys, cell_size, origin):
+        """
+        Einfluss aller Punkt-Attraktoren auf viele Zellen auf einmal.
+        Gleiche Formel wie GrowthPoint._point_influence, per Broadcasting.
+        
+        Returns: Array (len(xs), Anzahl Punkt-Attraktoren)
+        """
+        gp_px, gp_py, gp_strength, gp_radius = self._gp_arrays or self._build_growth_point_arrays()
+        ox, oy, _ = origin
+        wx = ox + xs * cell_size + cell_size * 0.5
+        wy = oy + ys * cell_size + cell_size * 0.5
+        
+        dx = wx[:, np.newaxis] - gp_px[np.newaxis, :]
+        dy = wy[:, np.newaxis] - gp_py[np.newaxis, :]
+        reach = gp_radius * cell_size
+        factor = np.maximum(0.0, 1.0 - np.sqrt(dx * dx + dy * dy) / reach)
+        return gp_strength * factor
     
     def set_start_cells(self, cells):
         """Setzt die Startzellen"""
         self.start_cells = list(cells)
+        self.start_cells_set = frozenset(self.start_cells)
     
     def set_start_groups(self, groups):
         """Setzt mehrere Startgruppen"""
@@ -689,6 +1551,7 @@ class GrowthEngine:
         self.start_cells = []
         for group in groups:
             self.start_cells.extend(group)
+        self.start_cells_set = frozenset(self.start_cells)
     
     def set_current_function(self, function):
         """
@@ -696,6 +1559,7 @@ class GrowthEngine:
         """
         self.current_function = function
         self._apply_function_preset(function)
+        self.runtime = RuntimeConfig(self.config, self.current_preset, function)
     
     def _apply_function_preset(self, function):
         """
@@ -725,22 +1589,6 @@ class GrowthEngine:
             preset.get('EDGE_BONUS_SCORE', '?')
         ))
     
-    def _get_preset_value(self, key, default=None):
-        """
-        Holt einen Wert aus dem aktuellen Preset oder der Config.
-        Preset hat Priorität über Config.
-        """
-        # Erst im aktuellen Preset schauen
-        if self.current_preset and key in self.current_preset:
-            return self.current_preset[key]
-        
-        # Dann in Config schauen
-        if hasattr(self.config, key):
-            return getattr(self.config, key)
-        
-        # Fallback
-        return default
-    
     def _get_outside_cells(self, grid):
         """
         Findet alle echten Außenzellen via Flood-Fill vom Grid-Rand.
@@ -749,339 +1597,427 @@ class GrowthEngine:
         Unterscheidet zwischen:
         - Echten Außenzellen: Vom Grid-Rand aus erreichbare leere Zellen
         - Inneren Löchern: Leere Zellen die von Struktur umschlossen sind
-        """
-        current_hash = hash(tuple(tuple(row) for row in grid.cells))
-        
-        if self._outside_cache_hash == current_hash:
-            return self._outside_cache
         
-        outside_cells = set()
-        visited = set()
-        queue = deque()
+        Returns: bool-Array (rows, cols), True = Außenzelle (nicht verändern)
+        """
+        current_hash = (grid.cols, grid.rows, grid.content_hash)
         
-        # Alle leeren Rand-Zellen als Startpunkte für Flood-Fill
-        for x in range(grid.cols):
-            for y in range(grid.rows):
-                is_edge = (x == 0 or x == grid.cols - 1 or 
-                          y == 0 or y == grid.rows - 1)
-                if is_edge and grid.is_empty(x, y):
-                    queue.append((x, y))
-                    visited.add((x, y))
-                    outside_cells.add((x, y))
+        outside = self._outside_cache.get(current_hash)
+        if outside is not None:
+            return outside
         
-        # Flood-Fill durch alle erreichbaren leeren Zellen
-        while queue:
-            cx, cy = queue.popleft()
-            for nx, ny in grid.neighbors_4(cx, cy):
-                if (nx, ny) not in visited and grid.is_empty(nx, ny):
-                    visited.add((nx, ny))
-                    outside_cells.add((nx, ny))
-                    queue.append((nx, ny))
+        if NUMBA_AVAILABLE:
+            outside = np.zeros((grid.rows, grid.cols), dtype=np.bool_)
+            bfs_outside(grid.cells, outside, self._bfs_buffers(grid)[1])
+        else:
+            outside = flood_fill_outside(grid.cells == 0)
         
-        self._outside_cache = outside_cells
-        self._outside_cache_hash = current_hash
-        return outside_cells
+        self._store_outside(current_hash, outside)
+        return outside
+    
+    def _store_outside(self, key, outside):
+        """Legt eine Außen-Maske im Cache ab (begrenzte Größe)"""
+        if len(self._outside_cache) >= 16:
+            self._outside_cache.clear()
+        self._outside_cache[key] = outside
     
-    def distance_to_outside(self, grid, x, y):
+    def _place_tentative(self, grid, x, y):
         """
-        Berechnet den kürzesten Abstand von Zelle (x,y) zur nächsten leeren Zelle.
-        Verwendet BFS (Breadth-First Search).
-        
-        Returns: int - Anzahl Schritte bis zur nächsten leeren Zelle
+        Belegt (x, y) probeweise und leitet den Außenbereich aus dem
+        gecachten Zustand davor ab, statt neu vom Rand zu füllen:
+        Belegen kann den Außenbereich nur verkleinern.
+        Zurücksetzen mit grid.set(x, y, 0) - der alte Eintrag bleibt im Cache.
         """
-        # Rand des Grids zählt als "außen" - prüfe zuerst
-        if x == 0 or x == grid.cols - 1 or y == 0 or y == grid.rows - 1:
-            return 1
-        
-        visited = set()
-        queue = deque([(x, y, 0)])
-        visited.add((x, y))
-        
-        while queue:
-            cx, cy, dist = queue.popleft()
-            
-            for nx, ny in grid.neighbors_4(cx, cy):
-                if (nx, ny) in visited:
-                    continue
-                
-                # Leere Zelle gefunden = Außen/Licht!
-                if grid.is_empty(nx, ny):
-                    return dist + 1
-                
-                visited.add((nx, ny))
-                queue.append((nx, ny, dist + 1))
+        before = self._get_outside_cells(grid)
+        grid.set(x, y, 1)
+        key = (grid.cols, grid.rows, grid.content_hash)
+        if key in self._outside_cache:
+            return
         
-        # Komplett eingeschlossen
-        return 9999
+        if not before[y, x]:
+            # (x, y) war kein Außen - Außenbereich unverändert
+            outside = before
+        elif (0 < x < grid.cols - 1 and 0 < y < grid.rows - 1
+                and self._outside_stays_connected(before, x, y)):
+            # Nur (x, y) selbst fällt weg
+            outside = before.copy()
+            outside[y, x] = False
+        else:
+            # Am Rand oder mögliche Engstelle: beim nächsten Zugriff neu füllen
+            return
+        self._store_outside(key, outside)
+    
+    def _bfs_buffers(self, grid):
+        """
+        Gibt (visited, queue, depth, stamp) für die BFS-Kernel zurück.
+        Der Stempel steigt pro Aufruf, visited wird nur bei neuer
+        Grid-Größe oder Überlauf neu angelegt.
+        """
+        size = grid.cols * grid.rows
+        if (self._bfs_visited is None or len(self._bfs_visited) != size
+                or self._bfs_stamp >= 2**31 - 2):
+            self._bfs_visited = np.zeros(size, dtype=np.int32)
+            self._bfs_queue = np.empty(size, dtype=np.int32)
+            self._bfs_depth = np.empty(size, dtype=np.int32)
+            self._bfs_stamp = 0
+        self._bfs_stamp += 1
+        return self._bfs_visited, self._bfs_queue, self._bfs_depth, self._bfs_stamp
+    
+    def _visit_buffer(self, grid):
+        """
+        Gibt (visited, stamp) für die Python-BFS ohne Numba zurück: eine
+        Liste mit einem Eintrag pro Zelle (Index y * cols + x), besucht
+        heißt visited[i] == stamp. Schneller als ein Set mit Tupeln, und
+        der Stempel erspart das Leeren zwischen zwei Suchen.
+        """
+        size = grid.cols * grid.rows
+        if len(self._visit_marks) != size:
+            self._visit_marks = [0] * size
+            self._visit_stamp = 0
+        self._visit_stamp += 1
+        return self._visit_marks, self._visit_stamp
     
     def distance_to_true_outside(self, grid, x, y):
         """
         Berechnet kürzesten Weg zum ECHTEN Außenbereich.
         Innere Löcher werden NICHT als außen gezählt.
         
-        Verwendet BFS um die Manhattan-Distanz zur nächsten
-        echten Außenzelle zu finden.
+        Liest das Abstandsfeld, falls es für diesen Grid-Zustand schon
+        existiert; sonst BFS zur nächsten echten Außenzelle
+        (Manhattan-Distanz).
         """
-        outside_cells = self._get_outside_cells(grid)
+        if self._edge_field_key == (grid.cols, grid.rows, grid.content_hash):
+            return int(self._edge_field[y, x])
         
-        if (x, y) in outside_cells:
+        outside = self._get_outside_cells(grid)
+        
+        if outside[y, x]:
             return 0
         
+        if NUMBA_AVAILABLE:
+            return int(bfs_nearest(outside, True, x, y, *self._bfs_buffers(grid)))
+        
         # BFS zur nächsten echten Außenzelle
-        visited = set([(x, y)])
+        cols, rows = grid.cols, grid.rows
+        visited, stamp = self._visit_buffer(grid)
+        visited[y * cols + x] = stamp
         queue = deque([(x, y, 0)])
+        queue_append = queue.append
+        queue_popleft = queue.popleft
         
         while queue:
-            cx, cy, dist = queue.popleft()
+            cx, cy, dist = queue_popleft()
             
-            for nx, ny in grid.neighbors_4(cx, cy):
-                if (nx, ny) in outside_cells:
+            for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                nx = cx + dx
+                ny = cy + dy
+                if not (0 <= nx < cols and 0 <= ny < rows):
+                    continue
+                if outside[ny, nx]:
                     return dist + 1
                 
-                if (nx, ny) not in visited:
-                    visited.add((nx, ny))
-                    queue.append((nx, ny, dist + 1))
+                i = ny * cols + nx
+                if visited[i] != stamp:
+                    visited[i] = stamp
+                    queue_append((nx, ny, dist + 1))
         
         return 9999
     
-    def score_candidate(self, grid, x, y, layer_index, lower_grid=None):
+    def _edge_distance_field(self, grid):
         """
-        Berechnet Gesamtscore für eine Kandidatenzelle.
-        Höher = besser
+        Manhattan-Abstand jeder Zelle zum echten Außenbereich als Array
+        (rows, cols): 0 für Außenzellen, 9999 wenn es keinen Außenbereich gibt.
+        Mit Numba eine Mehrquellen-BFS, sonst je zwei Spalten- und
+        Zeilenpässe; gecacht über den Inhalts-Hash.
         """
-        score = 0.0
-        
-        # 1. Growth Point Einfluss
-        for gp in self.growth_points:
-            influence = gp.get_influence(x, y, self.config.CELL_SIZE, self.constraints.origin)
-            
-            # Harte Blockade bei stark negativem Einfluss
-            if influence < self.config.HARD_BLOCKADE_THRESHOLD:
-                return float('-inf')  # Zelle wird NIEMALS gewählt
-            
-            score += influence * self.config.WEIGHT_GROWTHPOINT
-        
-        # 2. Verbindungs-Bonus - NEU: aus Preset!
-        weight_connected = self._get_preset_value('WEIGHT_CONNECTED', self.config.WEIGHT_CONNECTED)
-        neighbors = grid.count_alive_neighbors_4(x, y)
-        score += neighbors * weight_connected
-        
-        # 3. Glattheits-Score - NEU: aus Preset
-        weight_smoothness = self._get_preset_value('WEIGHT_SMOOTHNESS', self.config.WEIGHT_SMOOTHNESS)
-        smooth = self.smoothness.smoothness_score(grid, x, y)
-        score += smooth * weight_smoothness
-        
-        # 4. Konvexitäts-Score - NEU: aus Preset
-        weight_convexity = self._get_preset_value('WEIGHT_CONVEXITY', self.config.WEIGHT_CONVEXITY)
-        convex = self.smoothness.convexity_score(grid, x, y)
-        score += convex * weight_convexity
-        
-        # 5. Layer-Unterstützung mit Vererbungs-Einstellungen
-        if lower_grid:
-            inheritance = self.config.LAYER_INHERITANCE
-            freedom = self.config.LAYER_GROWTH_FREEDOM
-            
-            if lower_grid.is_alive(x, y):
-                # Zelle existiert unten = Bonus (skaliert mit Inheritance)
-                score += self.config.LAYER_SUPPORT_BONUS * inheritance
-            else:
-                # Keine Zelle unten = möglicher Penalty (skaliert mit 1-Freedom)
-                penalty = self.config.LAYER_OVERHANG_PENALTY * (1.0 - freedom) * inheritance
-                score -= penalty
+        key = (grid.cols, grid.rows, grid.content_hash)
+        if self._edge_field_key == key:
+            return self._edge_field
         
-        # 6. Licht-Score
-        light = self._compute_light_score(x, y, layer_index)
-        score += light * self.config.WEIGHT_LIGHT
+        outside = self._get_outside_cells(grid)
         
-        # 7. Distanz zu Hindernissen (Penalty)
-        obstacle_penalty = self._compute_obstacle_penalty(x, y)
-        score += obstacle_penalty * self.config.WEIGHT_OBSTACLE
+        if NUMBA_AVAILABLE:
+            dist = np.empty((grid.rows, grid.cols), dtype=np.int64)
+            bfs_distance_field(outside, dist, self._bfs_buffers(grid)[1])
+        else:
+            dist = np.where(outside, 0, 9999 + grid.cols + grid.rows)
+            for x in range(1, grid.cols):
+                np.minimum(dist[:, x], dist[:, x - 1] + 1, out=dist[:, x])
+            for x in range(grid.cols - 2, -1, -1):
+                np.minimum(dist[:, x], dist[:, x + 1] + 1, out=dist[:, x])
+            for y in range(1, grid.rows):
+                np.minimum(dist[y], dist[y - 1] + 1, out=dist[y])
+            for y in range(grid.rows - 2, -1, -1):
+                np.minimum(dist[y], dist[y + 1] + 1, out=dist[y])
+            np.minimum(dist, 9999, out=dist)
+        
+        self._edge_field = dist
+        self._outside_mask = outside
+        self._edge_field_key = key
+        return dist
+    
+    @staticmethod
+    def _outside_stays_connected(mask, x, y):
+        """
+        True wenn die Außen-Nachbarn (laut mask) der inneren Zelle (x, y)
+        über den 8er-Ring verbunden sind - dann trennt ein Belegen von (x, y)
+        nichts vom Außenbereich ab.
+        """
+        ring = [bool(mask[y + dy, x + dx]) for dx, dy in
+                ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))]
+        if all(ring):
+            return True
+        # Zusammenhängende Außen-Abschnitte im Ring, die einen 4-Nachbarn enthalten
+        runs = 0
+        for start in range(8):
+            if ring[start] and not ring[start - 1]:
+                i = start
+                has_side = False
+                while ring[i % 8]:
+                    has_side = has_side or i % 2 == 0
+                    i += 1
+                if has_side:
+                    runs += 1
+        return runs == 1
+    
+    def _distance_if_placed(self, grid, x, y, px, py):
+        """
+        Abstand von (px, py) zum echten Außenbereich, wenn (x, y) belegt
+        wäre - aus dem Abstandsfeld des aktuellen Grids, ohne es zu ändern.
+        Gibt None zurück, wenn das Feld dafür nicht reicht.
+        """
+        dist = self._edge_distance_field(grid)
+        outside = self._outside_mask
+        if not outside[y, x]:
+            # (x, y) gehört nicht zum Außenbereich - Belegen ändert ihn nicht
+            return int(dist[py, px])
+        if not (0 < x < grid.cols - 1 and 0 < y < grid.rows - 1
+                and self._outside_stays_connected(outside, x, y)):
+            # (x, y) am Rand oder mögliche Engstelle
+            return None
         
-        # 8. Bonus für Zellen nah am Rand (fördert dünne, verzweigte Strukturen) - NEU: aus Preset
-        edge_bonus = self._get_preset_value('EDGE_BONUS_SCORE', self.config.EDGE_BONUS_SCORE)
-        edge_threshold = self._get_preset_value('EDGE_DISTANCE_THRESHOLD', self.config.EDGE_DISTANCE_THRESHOLD)
+        # Außenbereich verliert nur (x, y)
+        if (px, py) == (x, y):
+            return 1  # ein 4-Nachbar bleibt außen
+        if outside[py, px]:
+            return 0
+        for nx, ny in grid.neighbors_4(px, py):
+            if outside[ny, nx] and (nx, ny) != (x, y):
+                return 1
+        d = int(dist[py, px])
+        if d < abs(px - x) + abs(py - y):
+            return d  # nächste Außenzelle ist nicht (x, y)
+        return None
+    
+    def _edge_distance_if_placed(self, grid, x, y):
+        """Abstand zum echten Außenbereich, wenn (x, y) belegt wäre"""
+        edge_dist = self._distance_if_placed(grid, x, y, x, y)
+        if edge_dist is not None:
+            return edge_dist
         
-        grid.set(x, y, 1)
-        self._outside_cache_hash = None  # Cache invalidieren
+        # Selten: (x, y) am Rand oder mögliche Engstelle - exakt per BFS
+        self._place_tentative(grid, x, y)
         edge_dist = self.distance_to_true_outside(grid, x, y)
         grid.set(x, y, 0)
-        self._outside_cache_hash = None
-        
-        if edge_dist <= edge_threshold:
-            score += edge_bonus
-        
-        # 9. NEU: Breiten-Score (bevorzugt dickere Äste)
-        width_score = self._compute_width_score(grid, x, y)
-        score += width_score
-        
-        return score
+        return edge_dist
     
-    def _compute_light_score(self, x, y, layer_index):
-        """Berechnet Licht-Score basierend auf Sonnenrichtung"""
-        sun = self.config.SUN_DIRECTION
-        # Normalisiere Sonnenrichtung (nur x, y)
-        sun_len = math.sqrt(sun[0]**2 + sun[1]**2)
-        if sun_len == 0:
-            return 0.5
-        
-        # Zellen in Sonnenrichtung bekommen mehr Licht
-        center_x = self.constraints.cols / 2
-        center_y = self.constraints.rows / 2
-        
-        dx = (x - center_x) / max(1, self.constraints.cols)
-        dy = (y - center_y) / max(1, self.constraints.rows)
-        
-        # Dot product mit Sonnenrichtung
-        dot = (dx * sun[0] + dy * sun[1]) / sun_len
-        
-        # Höhere Layer bekommen mehr Licht
-        height_bonus = layer_index * 0.05
+    def score_candidates(self, grid, candidates, layer_index, lower_grid=None):
+        """
+        Bewertet alle Kandidaten eines Wachstumsschritts auf einmal:
+        mit Numba über score_frontier, sonst über score_frontier_vectorized
+        (gleiches Ergebnis).
+        Gibt eine Liste von Scores zurück.
+        """
+        if not candidates:
+            return []
         
-        return (dot + 1.0) / 2.0 + height_bonus
+        support_field, light_field, obstacle_field = self._ensure_layer_fields(layer_index, lower_grid)
+        
+        xs = np.array([c[0] for c in candidates], dtype=np.int64)
+        ys = np.array([c[1] for c in candidates], dtype=np.int64)
+        growth_field = self._get_growth_field(xs, ys)
+        
+        # Rand-Bonus braucht die BFS und bleibt deshalb in Python
+        edge_bonus = float(self.runtime.EDGE_BONUS_SCORE)
+        edge_threshold = self.runtime.EDGE_DISTANCE_THRESHOLD
+        edge_scores = np.zeros(len(candidates), dtype=np.float64)
+        blocked = np.isneginf(growth_field[ys, xs])
+        for i, (x, y) in enumerate(candidates):
+            if not blocked[i] and self._edge_distance_if_placed(grid, x, y) <= edge_threshold:
+                edge_scores[i] = edge_bonus
+        
+        kernel = score_frontier if NUMBA_AVAILABLE else score_frontier_vectorized
+        scores = kernel(grid._padded, xs, ys, growth_field, support_field,
+                        light_field, obstacle_field, edge_scores,
+                        self._score_weights())
+        return scores.tolist()
+    
+    def _score_weights(self):
+        """Gewichte für score_frontier als Tupel von Floats"""
+        return (
+            float(self.runtime.WEIGHT_CONNECTED),
+            float(self.runtime.WEIGHT_SMOOTHNESS),
+            float(self.runtime.WEIGHT_CONVEXITY),
+            float(self.config.WEIGHT_LIGHT),
+            float(self.config.WEIGHT_OBSTACLE),
+            float(self.runtime.MIN_WIDTH),
+            float(self.runtime.PREFERRED_WIDTH),
+            float(self.runtime.WIDTH_SCORE_BONUS),
+            float(self.runtime.BALANCE_BONUS_WEIGHT),
+        )
     
-    def _compute_obstacle_penalty(self, x, y):
-        """Berechnet Penalty für Nähe zu Hindernissen"""
-        if (x, y) in self.constraints.obstacle_cells:
-            return -10.0  # Stark negativ
-        
-        # Prüfe Nachbarschaft zu Hindernissen
-        penalty = 0.0
-        for nx, ny in [(x+1,y), (x-1,y), (x,y+1), (x,y-1)]:
-            if (nx, ny) in self.constraints.obstacle_cells:
-                penalty -= 0.5
-        
-        return penalty
+    def _get_growth_field(self, xs, ys):
+        """
+        Growth-Point-Anteil des Scores pro Zelle (gewichtet, -inf = harte
+        Blockade). Wird nur für angefragte Zellen berechnet und gecacht.
+        """
+        cols, rows = self.constraints.cols, self.constraints.rows
+        field = self._growth_field
+        if field is None or field.shape != (rows, cols):
+            field = np.full((rows, cols), np.nan)
+            self._growth_field = field
+        
+        missing = np.isnan(field[ys, xs])
+        if missing.any():
+            cell_size = self.config.CELL_SIZE
+            origin = self.constraints.origin
+            threshold = self.config.HARD_BLOCKADE_THRESHOLD
+            weight = self.config.WEIGHT_GROWTHPOINT
+            mx = xs[missing]
+            my = ys[missing]
+            point_influence = self.point_influences(mx, my, cell_size, origin)
+            
+            # Summe in Reihenfolge der Growth Points
+            scores = np.zeros(len(mx))
+            blocked = np.zeros(len(mx), dtype=np.bool_)
+            point_index = 0
+            for gp in self.growth_points:
+                if gp.is_line and gp.curve:
+                    influence = gp.line_influences(mx, my, cell_size, origin)
+                elif gp.position:
+                    influence = point_influence[:, point_index]
+                    point_index += 1
+                else:
+                    continue
+                blocked |= influence < threshold
+                scores += influence * weight
+            
+            scores[blocked] = float('-inf')
+            field[my, mx] = scores
+        return field
+    
+    def _ensure_layer_fields(self, layer_index, lower_grid):
+        """Gibt die Score-Felder des Layers zurück und bindet sie bei Bedarf neu"""
+        key = self._layer_fields_key
+        if key is None or key[0] != layer_index or key[1] is not lower_grid:
+            self._bind_layer_fields(layer_index, lower_grid)
+        return self._layer_fields
     
-    def _compute_width_score(self, grid, x, y):
+    def _bind_layer_fields(self, layer_index, lower_grid):
         """
-        Berechnet Score basierend auf der Breite/Dicke des Astes.
-        SYMMETRISCH: Bewertet beide Richtungen gleich, kein Bias.
-        Nutzt jetzt Presets!
-        
-        Returns: float - Score bonus für Breite
+        Berechnet die Score-Felder eines Layers einmal als Arrays:
+        Layer-Unterstützung, Licht und Hindernis-Penalty.
         """
-        # NEU: Hole Werte aus Preset
-        min_width = self._get_preset_value('MIN_WIDTH', self.config.MIN_WIDTH)
-        preferred_width = self._get_preset_value('PREFERRED_WIDTH', getattr(self.config, 'PREFERRED_WIDTH', 3))
-        width_bonus = self._get_preset_value('WIDTH_SCORE_BONUS', getattr(self.config, 'WIDTH_SCORE_BONUS', 2.0))
-        
-        # Berechne Breite in beiden Richtungen
-        # Horizontal zählen (inkl. Kandidat)
-        count_h = 1
-        cx = x - 1
-        while cx >= 0 and grid.is_alive(cx, y):
-            count_h += 1
-            cx -= 1
-        cx = x + 1
-        while cx < grid.cols and grid.is_alive(cx, y):
-            count_h += 1
-            cx += 1
-        
-        # Vertikal zählen
-        count_v = 1
-        cy = y - 1
-        while cy >= 0 and grid.is_alive(x, cy):
-            count_v += 1
-            cy -= 1
-        cy = y + 1
-        while cy < grid.rows and grid.is_alive(x, cy):
-            count_v += 1
-            cy += 1
-        
-        # SYMMETRISCH: Score für beide Richtungen SEPARAT berechnen und addieren
-        # Das fördert gleichmäßiges Wachstum in beide Richtungen
-        score_h = 0.0
-        score_v = 0.0
+        cols, rows = self.constraints.cols, self.constraints.rows
         
-        # Horizontaler Score
-        if count_h < min_width:
-            score_h = -width_bonus * (min_width - count_h) * 0.5
-        elif count_h <= preferred_width:
-            score_h = width_bonus * (count_h - min_width) * 0.5
+        # Layer-Unterstützung: Bonus wo unten eine Zelle existiert
+        # (skaliert mit Inheritance), sonst Überhang-Penalty (skaliert mit 1-Freedom)
+        if lower_grid:
+            inheritance = self.config.LAYER_INHERITANCE
+            freedom = self.config.LAYER_GROWTH_FREEDOM
+            bonus = self.config.LAYER_SUPPORT_BONUS * inheritance
+            penalty = self.config.LAYER_OVERHANG_PENALTY * (1.0 - freedom) * inheritance
+            support_field = np.where(lower_grid.cells == 1, bonus, -penalty)
         else:
-            score_h = width_bonus * (preferred_width - min_width) * 0.5
+            support_field = np.zeros((rows, cols))
         
-        # Vertikaler Score
-        if count_v < min_width:
-            score_v = -width_bonus * (min_width - count_v) * 0.5
-        elif count_v <= preferred_width:
-            score_v = width_bonus * (count_v - min_width) * 0.5
+        # Licht: Zellen in Sonnenrichtung und höhere Layer bekommen mehr
+        sun = self.config.SUN_DIRECTION
+        sun_len = math.sqrt(sun[0]**2 + sun[1]**2)
+        if sun_len == 0:
+            light_field = np.full((rows, cols), 0.5)
         else:
-            score_v = width_bonus * (preferred_width - min_width) * 0.5
+            dx = (np.arange(cols) - cols / 2) / max(1, cols)
+            dy = (np.arange(rows) - rows / 2) / max(1, rows)
+            dot = (dx[np.newaxis, :] * sun[0] + dy[:, np.newaxis] * sun[1]) / sun_len
+            light_field = (dot + 1.0) / 2.0 + layer_index * 0.05
         
-        # Kombiniere beide Scores
-        # Bonus wenn BEIDE Richtungen gut sind (fördert quadratische Formen)
-        balance_bonus = 0.0
-        balance_weight = self._get_preset_value('BALANCE_BONUS_WEIGHT', getattr(self.config, 'BALANCE_BONUS_WEIGHT', 0.5))
-        if count_h >= 2 and count_v >= 2:
-            # Je ähnlicher die Breiten, desto mehr Bonus
-            max_count = max(count_h, count_v)
-            if max_count > 0:  # Sicherheitscheck gegen Division durch Null
-                ratio = min(count_h, count_v) / max_count
-                balance_bonus = width_bonus * ratio * balance_weight
+        # Hindernisse: -10 auf dem Hindernis, -0.5 pro angrenzender Hinderniszelle
+        if self.constraints.obstacle_mask is None:
+            self.constraints.finalize()
+        m = self.constraints.obstacle_mask.astype(np.float64)
+        obstacle_field = -0.5 * (m[1:-1, 2:] + m[1:-1, :-2] + m[2:, 1:-1] + m[:-2, 1:-1])
+        obstacle_field[m[1:-1, 1:-1] > 0] = -10.0
         
-        return score_h + score_v + balance_bonus
+        self._layer_fields = (support_field, light_field, obstacle_field)
+        self._layer_fields_key = (layer_index, lower_grid)
     
     def can_place(self, grid, x, y, layer_index, lower_grid=None):
         """
         Prüft ob eine Zelle platziert werden darf.
         Enthält neue Licht-Abstand-Prüfung!
-        """
-        # Grundlegende Constraint-Prüfung
-        if not self.constraints.is_allowed(x, y):
-            return False
-        
-        # Durchgehendes Loch (von unteren Ebenen)?
-        if self.vertical_holes_tracker.is_permanent_empty(x, y):
-            return False
         
+        Alle Prüfungen sind seiteneffektfrei, die Reihenfolge richtet sich
+        daher nur nach den Kosten: Array-Zugriffe zuerst, Bitmasken-Zählungen
+        vor der Verbindungsprüfung, Ast-Ende und Licht (BFS) zuletzt.
+        """
         # Bereits belegt?
         if grid.is_alive(x, y):
             return False
         
+        # Grundlegende Constraint-Prüfung
+        if not self.constraints.is_allowed(x, y):
+            return False
+        
         # Muss mindestens einen 4-Nachbarn haben
         if not grid.has_alive_neighbor_4(x, y):
             return False
         
+        # Durchgehendes Loch (von unteren Ebenen)?
+        if self.vertical_holes_tracker.is_permanent_empty(x, y):
+            return False
+        
         # NEU: Bei sehr niedriger Freedom: Nur über existierenden Zellen wachsen
         if lower_grid and self.config.LAYER_GROWTH_FREEDOM < self.config.STRICT_SUPPORT_THRESHOLD:
             if not lower_grid.is_alive(x, y):
                 return False
         
-        # Verbindung zur Startkomponente prüfen (wichtig für alle Layer!)
-        if not self._check_connectivity(grid, x, y):
-            return False
-        
         # ============================================================
         # NEU: FÜR INDUSTRY ALLE FORMPRÜFUNGEN ÜBERSPRINGEN!
         # ============================================================
-        max_dist = self._get_preset_value('LIGHT_DISTANCE', 
-            self.config.LIGHT_DISTANCE.get(self.current_function, self.config.DEFAULT_LIGHT_DISTANCE))
+        max_dist = self.runtime.LIGHT_DISTANCE
         
         if max_dist >= 30:
-            # Industry: Keine weiteren Prüfungen - erlaube alle verbundenen Zellen!
-            return True
+            # Industry: Nur Verbindung zur Startkomponente - erlaube alle verbundenen Zellen!
+            return self._check_connectivity(grid, x, y)
         
         # ============================================================
         # Ab hier nur für Work/Living (brauchen Licht und Verzweigungen):
         # ============================================================
         
+        # Lauflängen einmal zählen, für Mindestbreite und Linienlänge
+        runs = grid.run_lengths(x, y)
+        
         # Mindestbreite prüfen
-        if not self._check_min_width(grid, x, y):
+        if not self._check_min_width(grid, x, y, runs):
             return False
         
         # Maximale Linienlänge prüfen
-        if not self._check_max_line(grid, x, y):
+        if not self._check_max_line(grid, x, y, runs):
             return False
         
-        # Prüfe Licht-Abstand
-        if not self._check_light_distance(grid, x, y):
+        # Verbindung zur Startkomponente prüfen (wichtig für alle Layer!)
+        if not self._check_connectivity(grid, x, y):
             return False
         
         # Prüfe Ast-Ende-Breite (verhindert einzellige Finger)
         if not self._check_branch_end_width(grid, x, y):
             return False
         
+        # Prüfe Licht-Abstand
+        if not self._check_light_distance(grid, x, y):
+            return False
+        
         return True
     
     def _would_create_internal_hole(self, grid, x, y):
@@ -1099,41 +2035,64 @@ class GrowthEngine:
         if len(empty_neighbors) == 0:
             return False
         
-        grid.set(x, y, 1)
+        # Lokaler Test im 3x3-Fenster: liegen alle leeren 4-Nachbarn schon im
+        # echten Außenbereich und auf einem leeren Ringabschnitt, bleiben sie
+        # über den Ring mit dem Rand verbunden - kein Loch, keine BFS nötig
+        if 0 < x < grid.cols - 1 and 0 < y < grid.rows - 1:
+            if self._RING_CONNECTED[grid.ring_bits(x, y)]:
+                outside = self._get_outside_cells(grid)
+                if all(outside[ny, nx] for nx, ny in empty_neighbors):
+                    return False
         
+        # (x, y) gilt für die Suche als belegt, das Grid bleibt unverändert
         for nx, ny in empty_neighbors:
-            if not self._can_reach_edge(grid, nx, ny, max_depth=20):
-                grid.set(x, y, 0)
+            if not self._can_reach_edge(grid, nx, ny, max_depth=20, occupied=(x, y)):
                 return True
         
-        grid.set(x, y, 0)
         return False
     
-    def _can_reach_edge(self, grid, start_x, start_y, max_depth=20):
+    def _can_reach_edge(self, grid, start_x, start_y, max_depth=20, occupied=None):
         """
         Schnelle Prüfung ob eine Position den Grid-Rand erreichen kann.
-        Verwendet begrenzte BFS durch leere Zellen.
+        Verwendet begrenzte BFS durch leere Zellen; occupied=(x, y) gilt
+        dabei als belegt.
         """
         if start_x == 0 or start_x == grid.cols - 1 or start_y == 0 or start_y == grid.rows - 1:
             return True
         
-        visited = set([(start_x, start_y)])
+        if NUMBA_AVAILABLE:
+            vx, vy = occupied if occupied is not None else (-1, -1)
+            return bool(bfs_can_reach_edge(grid.cells, start_x, start_y, max_depth, vx, vy,
+                                           *self._bfs_buffers(grid)))
+        
+        cols, rows, cells = grid.cols, grid.rows, grid.cells
+        visited, stamp = self._visit_buffer(grid)
+        visited[start_y * cols + start_x] = stamp
         queue = deque([(start_x, start_y, 0)])
+        queue_append = queue.append
+        queue_popleft = queue.popleft
         
         while queue:
-            cx, cy, depth = queue.popleft()
+            cx, cy, depth = queue_popleft()
             
             if depth >= max_depth:
                 return True
             
-            for nx, ny in grid.neighbors_4(cx, cy):
-                if nx == 0 or nx == grid.cols - 1 or ny == 0 or ny == grid.rows - 1:
-                    if grid.is_empty(nx, ny):
-                        return True
+            for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                nx = cx + dx
+                ny = cy + dy
+                if not (0 <= nx < cols and 0 <= ny < rows) or cells[ny, nx] != 0:
+                    continue
+                if (nx, ny) == occupied:
+                    continue
                 
-                if (nx, ny) not in visited and grid.is_empty(nx, ny):
-                    visited.add((nx, ny))
-                    queue.append((nx, ny, depth + 1))
+                if nx == 0 or nx == cols - 1 or ny == 0 or ny == rows - 1:
+                    return True
+                
+                i = ny * cols + nx
+                if visited[i] != stamp:
+                    visited[i] = stamp
+                    queue_append((nx, ny, depth + 1))
         
         return False
     
@@ -1155,8 +2114,7 @@ class GrowthEngine:
           * Innere Hohlräume verhindert
         """
         # NEU: Hole LIGHT_DISTANCE aus Preset mit Fallback auf alte Logik
-        max_dist = self._get_preset_value('LIGHT_DISTANCE', 
-            self.config.LIGHT_DISTANCE.get(self.current_function, self.config.DEFAULT_LIGHT_DISTANCE))
+        max_dist = self.runtime.LIGHT_DISTANCE
         
         # NEU: Bei sehr großer Licht-Distanz (Industry), überspringe die Prüfung komplett
         # Für Industry (LIGHT_DISTANCE >= 30): Keine Einschränkungen, alle Zellen erlaubt
@@ -1168,30 +2126,38 @@ class GrowthEngine:
         if self._would_create_internal_hole(grid, x, y):
             return False
         
-        grid.set(x, y, 1)
-        self._outside_cache_hash = None  # Cache invalidieren
+        # Abstände der Zelle und ihrer belegten Nachbarn nach dem Platzieren,
+        # soweit möglich direkt aus dem Abstandsfeld
+        points = [(x, y)] + [(nx, ny) for nx, ny in grid.neighbors_4(x, y)
+                             if grid.is_alive(nx, ny)]
+        pending = []
+        for px, py in points:
+            dist = self._distance_if_placed(grid, x, y, px, py)
+            if dist is None:
+                pending.append((px, py))
+            elif dist > max_dist:
+                return False
+        
+        if not pending:
+            return True
         
+        # Rest exakt per BFS mit probeweise belegter Zelle
+        self._place_tentative(grid, x, y)
         try:
-            dist = self.distance_to_true_outside(grid, x, y)
-            if dist > max_dist:
-                return False
-            
-            for nx, ny in grid.neighbors_4(x, y):
-                if grid.is_alive(nx, ny):
-                    neighbor_dist = self.distance_to_true_outside(grid, nx, ny)
-                    if neighbor_dist > max_dist:
-                        return False
+            for px, py in pending:
+                if self.distance_to_true_outside(grid, px, py) > max_dist:
+                    return False
         finally:
             grid.set(x, y, 0)
-            self._outside_cache_hash = None
         
         return True
     
-    def _check_min_width(self, grid, x, y):
+    def _check_min_width(self, grid, x, y, runs=None):
         """
         Prüft ob Mindestbreite erfüllt ist (horizontal oder vertikal).
         Bei MIN_WIDTH <= 1 wird immer True zurückgegeben (keine Blockade).
         Die bevorzugte Breite wird stattdessen im Scoring berücksichtigt.
+        runs: bereits gezählte grid.run_lengths(x, y), sonst wird gezählt.
         """
         min_width = self.config.MIN_WIDTH
         
@@ -1199,31 +2165,8 @@ class GrowthEngine:
         if min_width <= 1:
             return True
         
-        # Horizontal zählen (inkl. Kandidat)
-        count_h = 1
-        # Links
-        cx = x - 1
-        while cx >= 0 and grid.is_alive(cx, y):
-            count_h += 1
-            cx -= 1
-        # Rechts
-        cx = x + 1
-        while cx < grid.cols and grid.is_alive(cx, y):
-            count_h += 1
-            cx += 1
-        
-        # Vertikal zählen
-        count_v = 1
-        # Oben
-        cy = y - 1
-        while cy >= 0 and grid.is_alive(x, cy):
-            count_v += 1
-            cy -= 1
-        # Unten
-        cy = y + 1
-        while cy < grid.rows and grid.is_alive(x, cy):
-            count_v += 1
-            cy += 1
+        # Horizontal und vertikal zählen (inkl. Kandidat)
+        count_h, count_v = runs if runs is not None else grid.run_lengths(x, y)
         
         return count_h >= min_width or count_v >= min_width
     
@@ -1246,9 +2189,9 @@ class GrowthEngine:
         Returns: True wenn erlaubt, False wenn blockiert
         """
         # NEU: Hole Werte aus Preset
-        min_cells_check = self._get_preset_value('MIN_CELLS_FOR_WIDTH_CHECK', getattr(self.config, 'MIN_CELLS_FOR_WIDTH_CHECK', 30))
-        max_finger_length = self._get_preset_value('MAX_THIN_FINGER_LENGTH', getattr(self.config, 'MAX_THIN_FINGER_LENGTH', 2))
-        min_end_width = self._get_preset_value('MIN_BRANCH_END_WIDTH', getattr(self.config, 'MIN_BRANCH_END_WIDTH', 2))
+        min_cells_check = self.runtime.MIN_CELLS_FOR_WIDTH_CHECK
+        max_finger_length = self.runtime.MAX_THIN_FINGER_LENGTH
+        min_end_width = self.runtime.MIN_BRANCH_END_WIDTH
         
         # Erst prüfen wenn genug Zellen existieren
         if grid.alive_count() < min_cells_check:
@@ -1258,15 +2201,15 @@ class GrowthEngine:
         if min_end_width <= 1:
             return True
         
-        # Simuliere Platzierung
-        grid.set(x, y, 1)
+        # Platzierung nur simulieren: (x, y) zählt unten als belegt,
+        # das Grid selbst bleibt unverändert
+        placed = (x, y)
         
-        # Zähle Nachbarn NACH Platzierung
+        # Zähle Nachbarn NACH Platzierung (die Zelle selbst ist kein Nachbar)
         neighbors_after = grid.count_alive_neighbors_4(x, y)
         
         # Wenn 2+ Nachbarn: Kein Ast-Ende, immer erlaubt
         if neighbors_after >= 2:
-            grid.set(x, y, 0)
             return True
         
         # Bei nur 1 Nachbar: Prüfe ob wir einen langen dünnen Finger erzeugen würden
@@ -1279,7 +2222,6 @@ class GrowthEngine:
                 break
         
         if not neighbor_pos:
-            grid.set(x, y, 0)
             return False  # Inkonsistenter Zustand - blockiere zur Sicherheit
         
         # Verfolge den "Finger" zurück und zähle wie lang der dünne Teil ist
@@ -1292,7 +2234,7 @@ class GrowthEngine:
             cx, cy = current
             
             # Zähle Breite an dieser Position (senkrecht zur Finger-Richtung)
-            width_here = self._count_perpendicular_width(grid, cx, cy, previous)
+            width_here = self._count_perpendicular_width(grid, cx, cy, previous, placed)
             
             if width_here >= min_end_width:
                 # Finger ist hier breit genug - OK!
@@ -1312,7 +2254,8 @@ class GrowthEngine:
             # verhindert, dass dünne Finger an existierenden dünnen Fingern wachsen.
             next_cell = None
             for nnx, nny in grid.neighbors_4(cx, cy):
-                if grid.is_alive(nnx, nny) and (nnx, nny) != previous:
+                if ((grid.is_alive(nnx, nny) or (nnx, nny) == placed)
+                        and (nnx, nny) != previous):
                     next_cell = (nnx, nny)
                     break
             
@@ -1323,12 +2266,10 @@ class GrowthEngine:
             previous = current
             current = next_cell
         
-        grid.set(x, y, 0)  # Zurücksetzen
-        
         # Blockiere wenn der dünne Finger zu lang wäre
         return thin_length <= max_finger_length
     
-    def _count_perpendicular_width(self, grid, x, y, direction_from):
+    def _count_perpendicular_width(self, grid, x, y, direction_from, placed=None):
         """
         Zählt die Breite senkrecht zur Finger-Richtung.
         
@@ -1336,6 +2277,7 @@ class GrowthEngine:
             grid: Das Grid
             x, y: Position zu prüfen
             direction_from: (px, py) - von wo wir kamen (bestimmt Richtung)
+            placed: (px, py) - simuliert platzierte Zelle, zählt als belegt
         
         Returns: int - Breite senkrecht zur Richtung
         """
@@ -1348,62 +2290,26 @@ class GrowthEngine:
         if dx == 0 and dy == 0:
             return 1
         
-        width = 1  # Die Zelle selbst
-        
+        # Die Zelle selbst plus belegte Zellen quer zur Richtung
+        count_h, count_v = grid.run_lengths(x, y, placed)
         if dx != 0:  # Finger geht horizontal, zähle vertikal
-            # Nach oben
-            cy = y - 1
-            while grid.in_bounds(x, cy) and grid.is_alive(x, cy):
-                width += 1
-                cy -= 1
-            # Nach unten
-            cy = y + 1
-            while grid.in_bounds(x, cy) and grid.is_alive(x, cy):
-                width += 1
-                cy += 1
-        else:  # Finger geht vertikal, zähle horizontal
-            # Nach links
-            cx = x - 1
-            while grid.in_bounds(cx, y) and grid.is_alive(cx, y):
-                width += 1
-                cx -= 1
-            # Nach rechts
-            cx = x + 1
-            while grid.in_bounds(cx, y) and grid.is_alive(cx, y):
-                width += 1
-                cx += 1
-        
-        return width
-    
-    def _check_max_line(self, grid, x, y):
-        """Prüft ob maximale Linienlänge nicht überschritten wird"""
+            return count_v
+        return count_h  # Finger geht vertikal, zähle horizontal
+    
+    def _check_max_line(self, grid, x, y, runs=None):
+        """
+        Prüft ob maximale Linienlänge nicht überschritten wird.
+        runs: bereits gezählte grid.run_lengths(x, y), sonst wird gezählt.
+        """
         # NEU: Hole MAX_LINE aus Preset
-        max_line = self._get_preset_value('MAX_LINE', self.config.MAX_LINE)
+        max_line = self.runtime.MAX_LINE
         
         # Bei sehr hohem MAX_LINE (Industry), überspringe die Prüfung
         if max_line >= 50:
             return True
         
-        # Gleiche Logik wie min_width, aber anderer Vergleich
-        count_h = 1
-        cx = x - 1
-        while cx >= 0 and grid.is_alive(cx, y):
-            count_h += 1
-            cx -= 1
-        cx = x + 1
-        while cx < grid.cols and grid.is_alive(cx, y):
-            count_h += 1
-            cx += 1
-        
-        count_v = 1
-        cy = y - 1
-        while cy >= 0 and grid.is_alive(x, cy):
-            count_v += 1
-            cy -= 1
-        cy = y + 1
-        while cy < grid.rows and grid.is_alive(x, cy):
-            count_v += 1
-            cy += 1
+        # Gleiche Zählung wie min_width, aber anderer Vergleich
+        count_h, count_v = runs if runs is not None else grid.run_lengths(x, y)
         
         # Mindestens eine Achse muss <= MAX_LINE sein
         return count_h <= max_line or count_v <= max_line
@@ -1427,45 +2333,48 @@ class GrowthEngine:
             # Keine lebende Startzelle, erlaube alles
             return True
         
-        # Temporär setzen und prüfen
-        grid.set(x, y, 1)
+        # Die Startkomponente ändert sich zwischen zwei Platzierungen nicht
+        # (gecacht); eine leere Zelle wäre verbunden, wenn ein 4-Nachbar
+        # dazugehört
         component = grid.get_component(start[0], start[1])
-        connected = (x, y) in component
-        grid.set(x, y, 0)  # Zurücksetzen
-        
-        return connected
+        if (x, y) in component:
+            return True
+        return any((nx, ny) in component for nx, ny in grid.neighbors_4(x, y))
     
     def get_frontier_candidates(self, grid):
-        """Findet alle Kandidatenzellen am Rand der aktuellen Form"""
-        candidates = set()
-        radius = self.config.FRONTIER_RADIUS
-        
-        for cx, cy in grid.get_all_alive_cells():
-            for dy in range(-radius, radius + 1):
-                for dx in range(-radius, radius + 1):
-                    if dx == 0 and dy == 0:
-                        continue
-                    nx, ny = cx + dx, cy + dy
-                    if grid.is_empty(nx, ny) and self.constraints.is_allowed(nx, ny):
-                        if not self.vertical_holes_tracker.is_permanent_empty(nx, ny):
-                            candidates.add((nx, ny))
-        
-        return list(candidates)
-    
-    def grow_layer(self, grid, layer_index, lower_grid=None):
         """
-        Hauptwachstumsalgorithmus für eine Ebene.
-        Gibt Anzahl platzierter Zellen zurück.
+        Findet alle Kandidatenzellen am Rand der aktuellen Form
+        (leer, erlaubt, kein Loch, im FRONTIER_RADIUS einer lebenden Zelle).
+        Zeilenweise sortiert.
         """
-        # Layer-spezifische Konfiguration
+        if self.constraints.allowed_mask is None:
+            self.constraints.finalize()
+        
+        near = grid.near_counts(self.config.FRONTIER_RADIUS)
+        mask = (near > 0) & (grid.cells == 0) & self.constraints.allowed_mask
+        
+        mask &= ~self.vertical_holes_tracker.mask_for(grid.cols, grid.rows)
+        
+        ys, xs = np.nonzero(mask)
+        return list(zip(xs.tolist(), ys.tolist()))
+    
+    def _layer_limits(self, layer_index):
+        """(grow_count, min_cells, max_cells) für einen Layer"""
         if layer_index < len(self.config.GROW_PER_GEN_LAYER):
-            grow_count = self.config.GROW_PER_GEN_LAYER[layer_index]
-            min_cells = self.config.MIN_CELLS_LAYER[layer_index]
-            max_cells = self.config.MAX_CELLS_LAYER[layer_index]
-        else:
-            grow_count = self.config.GROW_PER_GEN_LAYER[-1]
-            min_cells = self.config.MIN_CELLS_LAYER[-1]
-            max_cells = self.config.MAX_CELLS_LAYER[-1]
+            return (self.config.GROW_PER_GEN_LAYER[layer_index],
+                    self.config.MIN_CELLS_LAYER[layer_index],
+                    self.config.MAX_CELLS_LAYER[layer_index])
+        return (self.config.GROW_PER_GEN_LAYER[-1],
+                self.config.MIN_CELLS_LAYER[-1],
+                self.config.MAX_CELLS_LAYER[-1])
+    
+    def _grow_group(self, grid, layer_index, lower_grid):
+        """
+        Wachstum eines Grids für eine Ebene: Generationen bis grow_count,
+        dann auf MIN_CELLS auffüllen und auf MAX_CELLS kürzen.
+        Gibt Anzahl in den Generationen platzierter Zellen zurück.
+        """
+        grow_count, min_cells, max_cells = self._layer_limits(layer_index)
         
         placed = 0
         attempts = 0
@@ -1476,60 +2385,13 @@ class GrowthEngine:
             if not candidates:
                 break
             
-            # Score alle Kandidaten
-            scored = []
-            for (x, y) in candidates:
-                if self.can_place(grid, x, y, layer_index, lower_grid):
-                    s = self.score_candidate(grid, x, y, layer_index, lower_grid)
-                    scored.append(((x, y), s))
-            
-            if not scored:
-                attempts += 1
-                continue
-            
-            # Filtere Kandidaten mit -inf Score aus (von harter Blockade in score_candidate)
-            scored = [item for item in scored if item[1] != float('-inf')]
-            
-            if not scored:
-                attempts += 1
-                continue
-            
-            # Gewichtete Auswahl (höherer Score = höhere Wahrscheinlichkeit)
-            scored.sort(key=lambda item: item[1], reverse=True)
-            
-            # Top-Kandidaten mit Gewichtung
-            weights = []
-            for i, (pos, s) in enumerate(scored[:20]):  # Top 20
-                # Differenzierte Behandlung nach Score
-                if s < self.config.STRONGLY_NEGATIVE_THRESHOLD:
-                    weight = 0.001  # Stark negativ = fast keine Chance
-                elif s < 0:
-                    weight = self.config.NEGATIVE_SCORE_WEIGHT  # Leicht negativ = reduzierte Chance (0.3)
-                else:
-                    weight = math.exp(s * 0.5)  # Positiv = exponentiell
-                weights.append(weight)
-            
-            if not weights:
+            grew = self._grow_generation(grid, candidates, layer_index, lower_grid,
+                                         grow_count - placed)
+            if grew == 0:
                 attempts += 1
                 continue
             
-            total_weight = sum(weights)
-            if total_weight <= 0:
-                pick = scored[0][0]
-            else:
-                # Gewichtete Zufallsauswahl
-                r = random.random() * total_weight
-                cumulative = 0
-                pick = scored[0][0]
-                for i, w in enumerate(weights):
-                    cumulative += w
-                    if r <= cumulative:
-                        pick = scored[i][0]
-                        break
-            
-            x, y = pick
-            grid.set(x, y, 1)
-            placed += 1
+            placed += grew
             attempts = 0  # Reset bei Erfolg
         
         # Mindestanzahl erreichen
@@ -1547,6 +2409,13 @@ class GrowthEngine:
         
         return placed
     
+    def grow_layer(self, grid, layer_index, lower_grid=None):
+        """
+        Hauptwachstumsalgorithmus für eine Ebene.
+        Gibt Anzahl platzierter Zellen zurück.
+        """
+        return self._grow_group(grid, layer_index, lower_grid)
+    
     def grow_layer_multi_group(self, grids, layer_index, lower_grids=None):
         """
         Wachstum für mehrere unabhängige Gruppen.
@@ -1561,16 +2430,6 @@ class GrowthEngine:
         Returns:
             combined_grid: Ein Grid mit allen Zellen aller Gruppen
         """
-        # Layer-spezifische Konfiguration
-        if layer_index < len(self.config.GROW_PER_GEN_LAYER):
-            grow_count = self.config.GROW_PER_GEN_LAYER[layer_index]
-            min_cells = self.config.MIN_CELLS_LAYER[layer_index]
-            max_cells = self.config.MAX_CELLS_LAYER[layer_index]
-        else:
-            grow_count = self.config.GROW_PER_GEN_LAYER[-1]
-            min_cells = self.config.MIN_CELLS_LAYER[-1]
-            max_cells = self.config.MAX_CELLS_LAYER[-1]
-        
         # Jede Gruppe wächst unabhängig
         for group_idx, grid in enumerate(grids):
             lower_grid = lower_grids[group_idx] if lower_grids else None
@@ -1578,95 +2437,100 @@ class GrowthEngine:
             # Setze Startzellen für diese Gruppe als Referenz
             self.current_group_start = self.start_groups[group_idx]
             
-            # Wachstum für diese Gruppe
-            placed = 0
-            attempts = 0
-            
-            while placed < grow_count and attempts < self.config.MAX_GROW_ATTEMPTS:
-                candidates = self.get_frontier_candidates(grid)
-                
-                if not candidates:
-                    break
-                
-                # Score alle Kandidaten
-                scored = []
-                for (x, y) in candidates:
-                    if self.can_place(grid, x, y, layer_index, lower_grid):
-                        s = self.score_candidate(grid, x, y, layer_index, lower_grid)
-                        scored.append(((x, y), s))
-                
-                if not scored:
-                    attempts += 1
-                    continue
-                
-                # Filtere -inf Scores
-                scored = [item for item in scored if item[1] != float('-inf')]
-                
-                if not scored:
-                    attempts += 1
-                    continue
-                
-                # Gewichtete Auswahl
-                scored.sort(key=lambda item: item[1], reverse=True)
-                
-                weights = []
-                for i, (pos, s) in enumerate(scored[:20]):
-                    if s < self.config.STRONGLY_NEGATIVE_THRESHOLD:
-                        weight = 0.001
-                    elif s < 0:
-                        weight = self.config.NEGATIVE_SCORE_WEIGHT
-                    else:
-                        weight = math.exp(s * 0.5)
-                    weights.append(weight)
-                
-                if not weights:
-                    attempts += 1
-                    continue
-                
-                total_weight = sum(weights)
-                if total_weight <= 0:
-                    pick = scored[0][0]
-                else:
-                    r = random.random() * total_weight
-                    cumulative = 0
-                    pick = scored[0][0]
-                    for i, w in enumerate(weights):
-                        cumulative += w
-                        if r <= cumulative:
-                            pick = scored[i][0]
-                            break
-                
-                x, y = pick
-                grid.set(x, y, 1)
-                placed += 1
-                attempts = 0
-            
-            # Mindestanzahl erreichen
-            extra_attempts = 0
-            while grid.alive_count() < min_cells and extra_attempts < 10:
-                need = min_cells - grid.alive_count()
-                grew = self._grow_extra(grid, need, layer_index, lower_grid)
-                if grew == 0:
-                    break
-                extra_attempts += 1
-            
-            # Maximale Anzahl einhalten
-            if grid.alive_count() > max_cells:
-                self._prune_to_max(grid, max_cells)
+            self._grow_group(grid, layer_index, lower_grid)
             
             print("  Gruppe {}: {} Zellen".format(group_idx + 1, grid.alive_count()))
         
         # Zurücksetzen nach Multi-Gruppen-Wachstum
         self.current_group_start = []
         
-        # Kombiniere alle Grids zu einem
+        # Kombiniere alle Grids zu einem (ODER über die Zell-Arrays)
         combined = Grid(grids[0].cols, grids[0].rows)
-        for grid in grids:
-            for x, y in grid.get_all_alive_cells():
-                combined.set(x, y, 1)
+        combined.fill_mask(np.logical_or.reduce([grid.cells for grid in grids]))
         
         return combined
     
+    def _grow_generation(self, grid, candidates, layer_index, lower_grid, limit):
+        """
+        Eine Generation: bewertet die ganze Frontier einmal und platziert bis zu
+        BATCH_GROW_SIZE Zellen (höchstens limit) per gewichteter Auswahl aus den
+        Top 20. Ab der zweiten Zelle wird nur can_place neu geprüft, die Scores
+        bleiben die der Generation.
+        Gibt Anzahl platzierter Zellen zurück (0 = Fehlversuch).
+        """
+        # Einstellungen und Methoden einmal nachschlagen, nicht pro Kandidat
+        can_place = self.can_place
+        strongly_negative = self.config.STRONGLY_NEGATIVE_THRESHOLD
+        negative_weight = self.config.NEGATIVE_SCORE_WEIGHT
+        exp = math.exp
+        
+        # Score alle Kandidaten (vektorisiert, ohne die teuren Prüfungen)
+        scores = self.score_candidates(grid, candidates, layer_index, lower_grid)
+        
+        # Filtere Kandidaten mit -inf Score aus (harte Blockade durch Growth Points)
+        blocked = float('-inf')
+        scored = [item for item in zip(candidates, scores) if item[1] != blocked]
+        
+        # Top-Kandidaten: can_place (BFS für Licht und Löcher) nur in
+        # Score-Reihenfolge, bis 20 platzierbare gefunden sind - dieselben
+        # Top 20 wie beim Prüfen aller Kandidaten vor dem Bewerten
+        top = []
+        for (x, y), s in self._by_score(scored):
+            if can_place(grid, x, y, layer_index, lower_grid):
+                top.append(((x, y), s))
+                if len(top) == 20:
+                    break
+        if not top:
+            return 0
+        
+        weights = []
+        for pos, s in top:
+            # Differenzierte Behandlung nach Score
+            if s < strongly_negative:
+                weight = 0.001  # Stark negativ = fast keine Chance
+            elif s < 0:
+                weight = negative_weight  # Leicht negativ = reduzierte Chance (0.3)
+            else:
+                weight = exp(s * 0.5)  # Positiv = exponentiell
+            weights.append(weight)
+        
+        batch = min(max(1, self.config.BATCH_GROW_SIZE), limit)
+        placed = 0
+        while top and placed < batch:
+            total_weight = sum(weights)
+            index = 0
+            if total_weight > 0:
+                # Gewichtete Zufallsauswahl: erste Teilsumme >= r per Bisektion
+                r = random.random() * total_weight
+                index = bisect_left(list(accumulate(weights)), r)
+                if index == len(weights):
+                    index = 0  # r knapp über der letzten Teilsumme (Rundung)
+            
+            x, y = top.pop(index)[0]
+            weights.pop(index)
+            
+            # Erste Zelle ist bereits geprüft, weitere gegen das veränderte Grid
+            if placed > 0 and not can_place(grid, x, y, layer_index, lower_grid):
+                continue
+            grid.add_cell(x, y)
+            placed += 1
+        
+        return placed
+    
+    @staticmethod
+    def _by_score(scored, head=40):
+        """
+        Kandidaten absteigend nach Score, bei Gleichstand in Eingangsreihenfolge
+        (wie sorted(..., reverse=True)). Die ersten head kommen per
+        heapq.nlargest; der Rest wird nur sortiert, wenn die Auswahl weiter liest.
+        """
+        key = itemgetter(1)
+        for item in heapq.nlargest(head, scored, key=key):
+            yield item
+        if len(scored) > head:
+            for item in sorted(scored, key=key, reverse=True)[head:]:
+                yield item
+    
     def _grow_extra(self, grid, count, layer_index, lower_grid):
         """Zusätzliches Wachstum um Minimum zu erreichen"""
         placed = 0
@@ -1690,53 +2554,151 @@ class GrowthEngine:
         return placed
     
     def _prune_to_max(self, grid, max_cells):
-        """Reduziert Zellen auf Maximum (entfernt Randzellen)"""
-        while grid.alive_count() > max_cells:
-            # Finde Randzellen (wenige Nachbarn)
-            cells = grid.get_all_alive_cells()
-            
-            # Sortiere nach Anzahl Nachbarn (wenigste zuerst)
-            cells_with_neighbors = [
-                (x, y, grid.count_alive_neighbors_4(x, y))
-                for x, y in cells
-                if (x, y) not in self.start_cells  # Startzellen nicht entfernen
-            ]
-            cells_with_neighbors.sort(key=lambda c: c[2])
-            
-            if not cells_with_neighbors:
+        """
+        Reduziert Zellen auf Maximum (entfernt Randzellen).
+        Entfernt wird jeweils die Zelle mit den wenigsten Nachbarn, deren
+        Entfernen die Verbindung zur Startkomponente nicht bricht - geprüft
+        über die Gelenkpunkte statt per Probe-Entfernen mit BFS.
+        
+        Die Reihenfolge hält ein Min-Heap (Nachbarn, y, x): nach einer
+        Entfernung werden nur die Nachbarn neu eingetragen, veraltete
+        Einträge beim Herausnehmen übersprungen.
+        """
+        # Randzellen nach Anzahl Nachbarn (wenigste zuerst, dann zeilenweise)
+        start_set = self.start_cells_set
+        heap = [(grid.count_alive_neighbors_4(x, y), y, x)
+                for x, y in grid.get_all_alive_cells()
+                if (x, y) not in start_set]  # Startzellen nicht entfernen
+        heapq.heapify(heap)
+        
+        # Startzellen werden nie entfernt - die erste lebende bleibt dieselbe
+        start = None
+        for sx, sy in self.start_cells:
+            if grid.is_alive(sx, sy):
+                start = (sx, sy)
                 break
+        
+        connected = False
+        while grid.alive_count() > max_cells and heap:
+            if start and connected:
+                # Nach jeder Entfernung ist die Form zusammenhängend - keine
+                # Komponenten-BFS mehr, nur noch der Gelenkpunkt-Test
+                is_removable = self._non_articulation_check(grid, start)
+            else:
+                is_removable = self._removable_check(grid, grid.get_all_alive_cells(), start)
+            
+            # Entferne die erste Zelle, die die Verbindung nicht bricht
+            skipped = []
+            removed = None
+            while heap:
+                entry = heapq.heappop(heap)
+                count, y, x = entry
+                if count != grid.count_alive_neighbors_4(x, y):
+                    continue  # veraltet, aktueller Eintrag liegt weiter vorn
+                if is_removable((x, y)):
+                    removed = (x, y)
+                    break
+                skipped.append(entry)
             
-            # Entferne Zelle mit wenigsten Nachbarn
-            x, y, _ = cells_with_neighbors[0]
+            if removed is None:
+                # Jede Entfernung würde die Form zerteilen
+                break
             
-            # Prüfe ob Entfernen die Verbindung bricht
             grid.set(x, y, 0)
-            
-            # Prüfe Konnektivität
-            if self.start_cells:
-                start = None
-                for sx, sy in self.start_cells:
-                    if grid.is_alive(sx, sy):
-                        start = (sx, sy)
-                        break
-                
-                if start:
-                    component = grid.get_component(start[0], start[1])
-                    remaining = grid.get_all_alive_cells()
-                    
-                    if len(component) != len(remaining):
-                        # Verbindung gebrochen - rückgängig machen
-                        grid.set(x, y, 1)
-                        # Markiere als nicht entfernbar und versuche nächste
-                        continue
+            connected = True
+            for entry in skipped:
+                heapq.heappush(heap, entry)
+            for nx, ny in grid.neighbors_4(x, y):
+                if grid.is_alive(nx, ny) and (nx, ny) not in start_set:
+                    heapq.heappush(heap, (grid.count_alive_neighbors_4(nx, ny), ny, nx))
+    
+    def _removable_check(self, grid, cells, start):
+        """
+        Gibt eine Funktion zurück, die für eine Zelle sagt, ob nach ihrem
+        Entfernen noch alle belegten Zellen mit der Startkomponente
+        verbunden sind (start = erste lebende Startzelle; ohne: immer).
+        """
+        if not start:
+            return lambda cell: True
+        
+        component = grid.get_component(start[0], start[1])
+        if len(component) == len(cells):
+            # Zusammenhängend: alles außer Gelenkpunkten darf weg
+            return self._non_articulation_check(grid, start)
+        
+        # Schon zerteilt: verbunden wird es nur, wenn die einzige Zelle
+        # außerhalb der Startkomponente entfernt wird
+        outside = [cell for cell in cells if cell not in component]
+        if len(outside) == 1:
+            return lambda cell: cell == outside[0]
+        return lambda cell: False
+    
+    def _non_articulation_check(self, grid, start):
+        """
+        Prüffunktion "kein Gelenkpunkt" für ein zusammenhängendes Grid.
+        Liegen die belegten 4-Nachbarn einer Zelle auf einem belegten
+        Ringabschnitt, hält der Ring sie auch ohne die Zelle zusammen
+        (Ring-Tabelle mit vertauschten Rollen). Nur sonst werden die
+        Gelenkpunkte berechnet, einmal pro Grid-Zustand.
+        """
+        table = self._RING_CONNECTED
+        articulation = []
+        
+        def is_removable(cell):
+            if table[grid.ring_bits(cell[0], cell[1]) ^ 0xFF]:
+                return True
+            if not articulation:
+                articulation.append(self._articulation_points(grid, start))
+            return cell not in articulation[0]
+        
+        return is_removable
+    
+    def _articulation_points(self, grid, start):
+        """
+        Gelenkpunkte der Komponente von start: Zellen, deren Entfernen die
+        Komponente zerteilt. Tarjan (Entdeckungsindex und Low-Link) mit
+        eigenem Stack statt Rekursion.
+        """
+        index = {start: 0}
+        low = {start: 0}
+        points = set()
+        root_children = 0
+        counter = 1
+        stack = [(start, None, iter(grid.neighbors_4(*start)))]
+        
+        while stack:
+            cell, parent, neighbors = stack[-1]
+            for nxt in neighbors:
+                if nxt == parent or not grid.is_alive(*nxt):
+                    continue
+                if nxt in index:
+                    low[cell] = min(low[cell], index[nxt])
+                else:
+                    index[nxt] = low[nxt] = counter
+                    counter += 1
+                    stack.append((nxt, cell, iter(grid.neighbors_4(*nxt))))
+                    break
+            else:
+                # Alle Nachbarn besucht - Low-Link an den Vorgänger weitergeben
+                stack.pop()
+                if parent is None:
+                    continue
+                low[parent] = min(low[parent], low[cell])
+                if parent == start:
+                    root_children += 1
+                elif low[cell] >= index[parent]:
+                    points.add(parent)
+        
+        if root_children > 1:
+            points.add(start)
+        return points
     
     def remove_isolated(self, grid):
         """Entfernt isolierte Zellen (keine 4-Nachbarn)"""
         to_remove = []
-        for x, y in grid.get_all_alive_cells():
-            if grid.count_alive_neighbors_4(x, y) == 0:
-                if (x, y) not in self.start_cells:
-                    to_remove.append((x, y))
+        for x, y in grid.get_isolated_cells():
+            if (x, y) not in self.start_cells_set:
+                to_remove.append((x, y))
         
         for x, y in to_remove:
             grid.set(x, y, 0)
@@ -1757,37 +2719,28 @@ class GrowthEngine:
         Löcher markiert, da kompakte Flächen gewünscht sind.
         """
         # NEU: Prüfe ob Industry - wenn ja, keine Löcher markieren
-        max_dist = self._get_preset_value('LIGHT_DISTANCE', 
-            self.config.LIGHT_DISTANCE.get(self.current_function, self.config.DEFAULT_LIGHT_DISTANCE))
+        max_dist = self.runtime.LIGHT_DISTANCE
         
         if max_dist >= 30:
             return  # Keine Löcher für Industry-Layer markieren
         
         # Finde alle Positionen die innerhalb der besetzten Fläche leer sind
         # (d.h. "innere Löcher" die durch die Licht-Abstand-Logik entstanden sind)
-        all_alive = set(base_grid.get_all_alive_cells())
-        if not all_alive:
+        alive = base_grid.cells == 1
+        if not alive.any():
             return
         
-        # Finde Bounding Box der besetzten Zellen
-        min_x = min(x for x, y in all_alive)
-        max_x = max(x for x, y in all_alive)
-        min_y = min(y for x, y in all_alive)
-        max_y = max(y for x, y in all_alive)
-        
-        # Prüfe alle Positionen in der Bounding Box
-        for y in range(min_y, max_y + 1):
-            for x in range(min_x, max_x + 1):
-                if not base_grid.is_alive(x, y):
-                    # Prüfe ob Position "innen" liegt (hat Nachbarn auf allen Seiten)
-                    has_left = any(base_grid.is_alive(nx, y) for nx in range(0, x))
-                    has_right = any(base_grid.is_alive(nx, y) for nx in range(x + 1, base_grid.cols))
-                    has_top = any(base_grid.is_alive(x, ny) for ny in range(0, y))
-                    has_bottom = any(base_grid.is_alive(x, ny) for ny in range(y + 1, base_grid.rows))
-                    
-                    if has_left and has_right and has_top and has_bottom:
-                        # Dies ist ein "inneres Loch" - markiere als durchgehend
-                        self.vertical_holes_tracker.add_permanent_empty(x, y)
+        # Position liegt "innen", wenn links, rechts, oben und unten irgendwo
+        # eine belegte Zelle liegt - als laufendes ODER in alle vier Richtungen
+        # (für leere Zellen zählt die Zelle selbst nicht mit)
+        has_left = np.logical_or.accumulate(alive, axis=1)
+        has_right = np.logical_or.accumulate(alive[:, ::-1], axis=1)[:, ::-1]
+        has_top = np.logical_or.accumulate(alive, axis=0)
+        has_bottom = np.logical_or.accumulate(alive[::-1], axis=0)[::-1]
+        
+        # Dies sind "innere Löcher" - markiere als durchgehend
+        inner = ~alive & has_left & has_right & has_top & has_bottom
+        self.vertical_holes_tracker.add_permanent_empty_mask(inner)
     
     def sync_holes_from_previous_layer(self, current_grid):
         """
@@ -1799,26 +2752,16 @@ class GrowthEngine:
         - Alle leeren Zellen die vom Grid-Rand aus NICHT erreichbar sind = innere Löcher
         - Diese werden als permanent leer markiert für alle folgenden Layer
         """
-        all_alive = set(current_grid.get_all_alive_cells())
-        if not all_alive:
+        if current_grid.alive_count() == 0:
             return
         
-        # Finde Bounding Box der belegten Zellen
-        min_x = min(x for x, y in all_alive)
-        max_x = max(x for x, y in all_alive)
-        min_y = min(y for x, y in all_alive)
-        max_y = max(y for x, y in all_alive)
-        
-        # Finde echte Außenzellen via Flood-Fill
-        outside_cells = self._get_outside_cells(current_grid)
+        # Finde echte Außenzellen via Flood-Fill (gecacht)
+        outside = self._get_outside_cells(current_grid)
         
         # Alle leeren Zellen die NICHT von außen erreichbar sind = innere Löcher
-        for y in range(min_y, max_y + 1):
-            for x in range(min_x, max_x + 1):
-                if not current_grid.is_alive(x, y):
-                    if (x, y) not in outside_cells:
-                        # Dies ist ein inneres Loch - markiere als durchgehend
-                        self.vertical_holes_tracker.add_permanent_empty(x, y)
+        # (liegen immer in der Bounding Box der belegten Zellen) - markiere als durchgehend
+        inner = (current_grid.cells == 0) & ~outside
+        self.vertical_holes_tracker.add_permanent_empty_mask(inner)
 
 
 # ============================================================================
@@ -1833,13 +2776,31 @@ class Visualizer:
         self.constraints = constraints
         self.cell_objects = {}  # (x, y, layer) -> GUID
         self.visual_count = 0
+        # Objekt-Attribute (Layer + Farbe) pro Farbe, gültig für _layer_index
+        self._attributes = {}
+        self._layer_index = None
     
     def ensure_layer(self):
         """Erstellt Layer falls nicht vorhanden"""
         if not rs.IsLayer(self.config.LAYER_NAME):
             rs.AddLayer(self.config.LAYER_NAME)
+        index = sc.doc.Layers.FindByFullPath(self.config.LAYER_NAME, -1)
+        if index != self._layer_index:
+            self._layer_index = index
+            self._attributes = {}
         return self.config.LAYER_NAME
     
+    def _attributes_for(self, color):
+        """Attribute mit Layer und Objektfarbe, einmal pro Farbe angelegt"""
+        attributes = self._attributes.get(color)
+        if attributes is None:
+            attributes = Rhino.DocObjects.ObjectAttributes()
+            attributes.LayerIndex = self._layer_index
+            attributes.ObjectColor = rs.coercecolor(color)
+            attributes.ColorSource = Rhino.DocObjects.ObjectColorSource.ColorFromObject
+            self._attributes[color] = attributes
+        return attributes
+    
     def make_box(self, x, y, layer, color):
         """Erstellt eine Box für eine Zelle"""
         if self.visual_count >= self.config.MAX_VISUAL_BOXES:
@@ -1851,26 +2812,21 @@ class Visualizer:
         x0 = ox + x * cell
         y0 = oy + y * cell
         z0 = oz + layer * cell
-        z1 = z0 + cell
-        
-        corners = [
-            (x0, y0, z0),
-            (x0 + cell, y0, z0),
-            (x0 + cell, y0 + cell, z0),
-            (x0, y0 + cell, z0),
-            (x0, y0, z1),
-            (x0 + cell, y0, z1),
-            (x0 + cell, y0 + cell, z1),
-            (x0, y0 + cell, z1)
-        ]
         
+        box = rg.Box(
+            rg.Plane.WorldXY,
+            rg.Interval(x0, x0 + cell),
+            rg.Interval(y0, y0 + cell),
+            rg.Interval(z0, z0 + cell)
+        )
+        
+        # Direkt mit fertigen Attributen: ein Aufruf pro Box statt
+        # rs.AddBox + ObjectColor + ObjectLayer (und ohne Redraw pro Box)
         try:
-            box = rs.AddBox(corners)
-            if box:
-                rs.ObjectColor(box, color)
-                rs.ObjectLayer(box, self.config.LAYER_NAME)
+            box_id = sc.doc.Objects.AddBox(box, self._attributes_for(color))
+            if box_id != System.Guid.Empty:
                 self.visual_count += 1
-                return box
+                return box_id
         except:
             pass
         
@@ -1885,23 +2841,22 @@ class Visualizer:
         
         rs.EnableRedraw(False)
         
-        for y in range(grid.rows):
-            for x in range(grid.cols):
-                if self.visual_count >= self.config.MAX_VISUAL_BOXES:
-                    rs.EnableRedraw(True)
-                    return
+        # Nur belegte Zellen (zeilenweise, wie zuvor die Doppelschleife)
+        for x, y in grid.get_all_alive_cells():
+            if self.visual_count >= self.config.MAX_VISUAL_BOXES:
+                rs.EnableRedraw(True)
+                return
+            
+            # Nur erstellen wenn noch nicht existiert
+            if (x, y, layer_index) not in self.cell_objects:
+                if (x, y) in start_cells:
+                    draw_color = self.config.COLORS["Start"]
+                else:
+                    draw_color = color
                 
-                if grid.is_alive(x, y):
-                    # Nur erstellen wenn noch nicht existiert
-                    if (x, y, layer_index) not in self.cell_objects:
-                        if (x, y) in start_cells:
-                            draw_color = self.config.COLORS["Start"]
-                        else:
-                            draw_color = color
-                        
-                        guid = self.make_box(x, y, layer_index, draw_color)
-                        if guid:
-                            self.cell_objects[(x, y, layer_index)] = guid
+                guid = self.make_box(x, y, layer_index, draw_color)
+                if guid:
+                    self.cell_objects[(x, y, layer_index)] = guid
         
         rs.EnableRedraw(True)
     
@@ -1921,7 +2876,15 @@ class Visualizer:
         self.cell_objects.clear()
         self.visual_count = 0
         
-        # Neue Boxen erstellen
+        # Neue Boxen erstellen, Ansicht erst am Ende neu zeichnen
+        rs.EnableRedraw(False)
+        try:
+            self._add_layers(layers, layer_functions, start_cells)
+        finally:
+            rs.EnableRedraw(True)
+    
+    def _add_layers(self, layers, layer_functions, start_cells):
+        """Erstellt die Boxen aller Layer bis MAX_VISUAL_BOXES"""
         for layer_index, grid in enumerate(layers):
             # Farbe basierend auf Funktion
             if layer_index < len(layer_functions):
@@ -1930,21 +2893,20 @@ class Visualizer:
             else:
                 color = self.config.COLORS["Default"]
             
-            for y in range(grid.rows):
-                for x in range(grid.cols):
-                    if self.visual_count >= self.config.MAX_VISUAL_BOXES:
-                        return
-                    
-                    if grid.is_alive(x, y):
-                        # Startzellen bekommen Spezialfarbe
-                        if (x, y) in start_cells:
-                            draw_color = self.config.COLORS["Start"]
-                        else:
-                            draw_color = color
-                        
-                        guid = self.make_box(x, y, layer_index, draw_color)
-                        if guid:
-                            self.cell_objects[(x, y, layer_index)] = guid
+            # Nur belegte Zellen (zeilenweise)
+            for x, y in grid.get_all_alive_cells():
+                if self.visual_count >= self.config.MAX_VISUAL_BOXES:
+                    return
+                
+                # Startzellen bekommen Spezialfarbe
+                if (x, y) in start_cells:
+                    draw_color = self.config.COLORS["Start"]
+                else:
+                    draw_color = color
+                
+                guid = self.make_box(x, y, layer_index, draw_color)
+                if guid:
+                    self.cell_objects[(x, y, layer_index)] = guid
     
     def clear(self):
         """Löscht alle visualisierten Objekte"""
@@ -2253,43 +3215,34 @@ class Simulation:
         self.start_cells = []
         self.start_groups = []  # NEU: Liste von Startgruppen
     
-    def _shrink_to_target(self, grid, target_cells):
-        """Reduziert Zellen auf Zielanzahl (entfernt Randzellen von außen nach innen)"""
-        while grid.alive_count() > target_cells:
-            cells = grid.get_all_alive_cells()
-            
-            # Sortiere nach Anzahl Nachbarn (wenigste zuerst = Rand)
-            cells_with_neighbors = [
-                (x, y, grid.count_alive_neighbors_4(x, y))
-                for x, y in cells
-                if (x, y) not in self.start_cells
-            ]
-            cells_with_neighbors.sort(key=lambda c: c[2])
-            
-            if not cells_with_neighbors:
-                break
-            
-            # Entferne Zelle mit wenigsten Nachbarn
-            x, y, _ = cells_with_neighbors[0]
-            
-            # Prüfe ob Entfernen die Verbindung bricht
-            grid.set(x, y, 0)
-            
-            # Prüfe Konnektivität
-            if self.start_cells:
-                start = None
-                for sx, sy in self.start_cells:
-                    if grid.is_alive(sx, sy):
-                        start = (sx, sy)
-                        break
-                
-                if start:
-                    component = grid.get_component(start[0], start[1])
-                    remaining = grid.get_all_alive_cells()
-                    
-                    if len(component) != len(remaining):
-                        # Verbindung gebrochen - rückgängig machen
-                        grid.set(x, y, 1)
+    def _start_grid(self, cells, check_allowed):
+        """
+        Neues Grid mit gesetzten Startzellen. Mit check_allowed nur die
+        erlaubten (ab Layer 1, Layer 0 setzt alle).
+        """
+        grid = Grid(self.constraints.cols, self.constraints.rows)
+        is_allowed = self.constraints.is_allowed
+        for x, y in cells:
+            if not check_allowed or is_allowed(x, y):
+                grid.set(x, y, 1)
+        return grid
+    
+    def _estimated_memory_mb(self, layer_count):
+        """Geschätzter Speicherbedarf der Simulation in MB"""
+        cells = self.constraints.cols * self.constraints.rows
+        per_cell = self.config.BYTES_PER_CELL_SHARED + self.config.BYTES_PER_CELL_LAYER * layer_count
+        return cells * per_cell / (1024.0 * 1024.0)
+    
+    def _redraw_layer(self, layer_idx, layer_count):
+        """
+        Zeichnet den Viewport nach einem Layer neu - nur jeden REDRAW_EVERY-ten
+        und den letzten. Die Pause folgt nur auf ein Neuzeichnen nach Layer 0.
+        """
+        if layer_idx % self.config.REDRAW_EVERY and layer_idx != layer_count - 1:
+            return
+        Rhino.RhinoDoc.ActiveDoc.Views.Redraw()
+        if layer_idx > 0 and self.config.PAUSE_BETWEEN_LAYERS > 0:
+            time.sleep(self.config.PAUSE_BETWEEN_LAYERS)
     
     def run(self):
         """Führt die komplette Simulation aus"""
@@ -2313,9 +3266,11 @@ class Simulation:
         self.constraints.set_boundary(boundary)
         print("Grid: {} x {} Zellen".format(self.constraints.cols, self.constraints.rows))
         
-        # Sicherheitsprüfung
-        if self.constraints.cols * self.constraints.rows > 300000:
-            self.ui.show_message("Grid zu groß! Bitte kleinere Grenze oder größere Zellengröße.")
+        # Sicherheitsprüfung: geschätzter Speicherbedarf statt fester Zellenzahl
+        estimated_mb = self._estimated_memory_mb(layer_count)
+        if estimated_mb > self.config.MAX_MEMORY_MB:
+            self.ui.show_message("Grid zu groß (ca. {:.0f} MB)! Bitte kleinere Grenze oder größere Zellengröße.".format(
+                estimated_mb))
             return
         
         # 4. Äußere Linien
@@ -2344,6 +3299,9 @@ class Simulation:
         for obstacle in self.ui.choose_obstacles():
             self.constraints.add_obstacle(obstacle)
         
+        # Erlaubte Zellen einmal vorberechnen
+        self.constraints.finalize()
+        
         # 8. Growth Engine erstellen
         self.growth_engine = GrowthEngine(self.config, self.constraints, self.vertical_holes_tracker)
         # GrowthEngine über Gruppen informieren
@@ -2392,11 +3350,7 @@ class Simulation:
         """Führt die Layer-Simulation für eine einzelne Gruppe aus"""
         
         # Erste Ebene erstellen
-        base_grid = Grid(self.constraints.cols, self.constraints.rows)
-        
-        # Startzellen setzen
-        for x, y in self.start_cells:
-            base_grid.set(x, y, 1)
+        base_grid = self._start_grid(self.start_cells, check_allowed=False)
         
         # Funktion für erste Ebene setzen
         func = self.layer_functions[0] if self.layer_functions else "Living"
@@ -2423,7 +3377,7 @@ class Simulation:
         
         # Visualisierung - nur Layer 0 hinzufügen (inkrementell)
         self.visualizer.add_layer(base_grid, 0, func, self.start_cells)
-        Rhino.RhinoDoc.ActiveDoc.Views.Redraw()
+        self._redraw_layer(0, layer_count)
         
         # Weitere Ebenen
         for layer_idx in range(1, layer_count):
@@ -2442,16 +3396,10 @@ class Simulation:
             
             # NEU: Echtes Wachstum statt nur Kopieren
             prev_grid = self.layers[-1]
-            new_grid = Grid(self.constraints.cols, self.constraints.rows)
-            
-            # Startzellen setzen
-            for x, y in self.start_cells:
-                if self.constraints.is_allowed(x, y):
-                    new_grid.set(x, y, 1)
+            new_grid = self._start_grid(self.start_cells, check_allowed=True)
             
             # Durchgehende Löcher anwenden (von unteren Ebenen)
-            for (hx, hy) in self.vertical_holes_tracker.get_all():
-                new_grid.set(hx, hy, 0)
+            new_grid.clear_mask(self.vertical_holes_tracker.mask_for(new_grid.cols, new_grid.rows))
             
             # ECHTES WACHSTUM mit prev_grid als lower_grid Referenz!
             self.growth_engine.grow_layer(new_grid, layer_idx, prev_grid)
@@ -2460,8 +3408,7 @@ class Simulation:
             self.growth_engine.enforce_start_cells(new_grid)
             
             # Durchgehende Löcher nochmal anwenden
-            for (hx, hy) in self.vertical_holes_tracker.get_all():
-                new_grid.set(hx, hy, 0)
+            new_grid.clear_mask(self.vertical_holes_tracker.mask_for(new_grid.cols, new_grid.rows))
             
             self.layers.append(new_grid)
             print("Layer {}: {} Zellen".format(layer_idx, new_grid.alive_count()))
@@ -2471,9 +3418,7 @@ class Simulation:
             
             # Visualisierung aktualisieren - nur neuen Layer hinzufügen (inkrementell)
             self.visualizer.add_layer(new_grid, layer_idx, func, self.start_cells)
-            Rhino.RhinoDoc.ActiveDoc.Views.Redraw()
-            
-            time.sleep(0.1)
+            self._redraw_layer(layer_idx, layer_count)
         
         print("Simulation fertig!")
     
@@ -2483,12 +3428,8 @@ class Simulation:
         num_groups = len(self.start_groups)
         
         # Ein Grid pro Gruppe für Layer 0
-        base_grids = []
-        for group_idx, group_cells in enumerate(self.start_groups):
-            grid = Grid(self.constraints.cols, self.constraints.rows)
-            for x, y in group_cells:
-                grid.set(x, y, 1)
-            base_grids.append(grid)
+        base_grids = [self._start_grid(group_cells, check_allowed=False)
+                      for group_cells in self.start_groups]
         
         # Funktion für erste Ebene
         func = self.layer_functions[0] if self.layer_functions else "Living"
@@ -2514,7 +3455,7 @@ class Simulation:
         
         # Visualisierung
         self.visualizer.add_layer(combined_grid, 0, func, self.start_cells)
-        Rhino.RhinoDoc.ActiveDoc.Views.Redraw()
+        self._redraw_layer(0, layer_count)
         
         # Speichere Grids pro Gruppe für nächste Layer
         previous_grids = base_grids
@@ -2527,13 +3468,8 @@ class Simulation:
             print("Layer {}: Wachstum für {} Gruppen (Funktion: {})...".format(layer_idx, num_groups, func))
             
             # Neue Grids für diesen Layer
-            new_grids = []
-            for group_idx, group_cells in enumerate(self.start_groups):
-                grid = Grid(self.constraints.cols, self.constraints.rows)
-                for x, y in group_cells:
-                    if self.constraints.is_allowed(x, y):
-                        grid.set(x, y, 1)
-                new_grids.append(grid)
+            new_grids = [self._start_grid(group_cells, check_allowed=True)
+                         for group_cells in self.start_groups]
             
             # Wachstum
             combined_grid = self.growth_engine.grow_layer_multi_group(new_grids, layer_idx, previous_grids)
@@ -2543,8 +3479,8 @@ class Simulation:
             self.growth_engine.enforce_start_cells(combined_grid)
             
             # Durchgehende Löcher anwenden
-            for (hx, hy) in self.vertical_holes_tracker.get_all():
-                combined_grid.set(hx, hy, 0)
+            combined_grid.clear_mask(
+                self.vertical_holes_tracker.mask_for(combined_grid.cols, combined_grid.rows))
             
             self.layers.append(combined_grid)
             print("Layer {} gesamt: {} Zellen".format(layer_idx, combined_grid.alive_count()))
@@ -2554,10 +3490,9 @@ class Simulation:
             
             # Visualisierung
             self.visualizer.add_layer(combined_grid, layer_idx, func, self.start_cells)
-            Rhino.RhinoDoc.ActiveDoc.Views.Redraw()
+            self._redraw_layer(layer_idx, layer_count)
             
             previous_grids = new_grids
-            time.sleep(0.1)
         
         print("Simulation fertig!")
 
@@ -2572,7 +3507,7 @@ def main():
         rs.MessageBox("Fehler: {}".format(str(e)), 0, "Fehler")
 
 
+# Nur beim Ausführen als Skript starten (Rhino führt Skripte als __main__ aus);
+# beim Importieren, z.B. zum Profilen, läuft keine Simulation
 if __name__ == "__main__":
     main()
-else:
-    main()
\ No newline at end of file